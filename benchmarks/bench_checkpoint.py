@@ -0,0 +1,52 @@
+"""
+Benchmark of the checkpoint journal overhead per extracted article.
+
+Appends synthetic article records to a journal, with and without fsync, and reloads it
+the way a resumed run does.
+
+Usage:
+    python benchmarks/bench_checkpoint.py [article_count]
+"""
+import json
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.bench_excel_writer import synthetic_articles
+from src.checkpoint import CheckpointJournal
+
+
+def main():
+    article_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    articles = list(synthetic_articles(article_count))
+    payload = {"search_phrase": "fifa", "news_categories": ["Sports"], "number_of_months": 12}
+    search_dates_range = {"start_date": "01/01/2023", "end_date": "12/31/2023"}
+
+    results = {"articles": article_count}
+    for fsync in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = CheckpointJournal(directory, payload, search_dates_range, fsync=fsync)
+            started = time.perf_counter()
+            for article in articles:
+                journal.append(article, directory)
+            journal.close()
+            append_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            resumed = CheckpointJournal(directory, payload, search_dates_range).load()
+            load_seconds = time.perf_counter() - started
+
+        results["fsync" if fsync else "flush_only"] = {
+            "append_seconds": round(append_seconds, 4),
+            "microseconds_per_article": round(append_seconds / article_count * 1e6, 1),
+            "resume_load_seconds": round(load_seconds, 4),
+            "resumed": len(resumed),
+        }
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
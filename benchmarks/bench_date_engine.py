@@ -0,0 +1,102 @@
+"""
+Micro-benchmark of the date engine against the previous per-call parsing.
+
+Parses a corpus of realistic NYT search-result dates and checks each one against the
+search dates range, the way `extract_articles` does for every article.
+
+Usage:
+    python benchmarks/bench_date_engine.py [corpus_size]
+"""
+import datetime
+import json
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from src.date_engine import DateParser, DateRange
+
+MONTH_LABELS = ["Jan.", "Feb.", "March", "April", "May", "June", "July", "Aug.", "Sept.", "Oct.", "Nov.", "Dec."]
+
+
+def build_corpus(size: int, seed: int = 0) -> list:
+    """Build a list of date texts mixing relative, month-day and full dates."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.05:
+            corpus.append(f"{rng.randint(1, 23)}h ago")
+        elif kind < 0.08:
+            corpus.append(f"{rng.randint(1, 59)}m ago")
+        elif kind < 0.6:
+            corpus.append(f"{rng.choice(MONTH_LABELS)} {rng.randint(1, 28)}")
+        else:
+            corpus.append(f"{rng.choice(MONTH_LABELS)} {rng.randint(1, 28)}, {rng.randint(2015, 2023)}")
+    return corpus
+
+
+def legacy_text_to_formatted_date(date_text: str) -> str:
+    """The previous Utility.text_to_formatted_date, kept here as the baseline."""
+    month_abbr_mapping = {
+        "Jan.": "January", "Feb.": "February", "Mar.": "March", "Apr.": "April", "May": "May", "June": "June",
+        "July": "July", "Aug.": "August", "Sept.": "September", "Oct.": "October", "Nov.": "November", "Dec.": "December"
+    }
+    date_text_cleaned = ' '.join([month_abbr_mapping.get(word, word) for word in date_text.split()])
+    if re.match(r'^[A-Za-z]+\s+\d+$', date_text_cleaned):
+        date_text_cleaned = f"{date_text_cleaned}, {datetime.datetime.now().year}"
+    hours_ago_match = re.match(r'(\d+)h ago', date_text)
+    if hours_ago_match:
+        return (datetime.datetime.now() - datetime.timedelta(hours=int(hours_ago_match.group(1)))).strftime('%m/%d/%Y')
+    minutes_ago_match = re.match(r'(\d+)m ago', date_text)
+    if minutes_ago_match:
+        return (datetime.datetime.now() - datetime.timedelta(minutes=int(minutes_ago_match.group(1)))).strftime('%m/%d/%Y')
+    try:
+        return datetime.datetime.strptime(date_text_cleaned, '%B %d, %Y').strftime('%m/%d/%Y')
+    except ValueError:
+        return date_text
+
+
+def legacy_is_date_in_range(date: str, search_dates_range: dict) -> bool:
+    """The previous Utility.is_date_in_range, kept here as the baseline."""
+    start_date = datetime.datetime.strptime(search_dates_range['start_date'], '%m/%d/%Y')
+    end_date = datetime.datetime.strptime(search_dates_range['end_date'], '%m/%d/%Y')
+    try:
+        current_date = datetime.datetime.strptime(date, '%m/%d/%Y')
+    except ValueError:
+        return False
+    return start_date <= current_date <= end_date
+
+
+def run_legacy(corpus: list, search_dates_range: dict) -> int:
+    # The previous flow parsed every date twice: once during extraction and again in the final filter.
+    kept = [text for text in corpus if legacy_is_date_in_range(legacy_text_to_formatted_date(text), search_dates_range)]
+    return len([text for text in kept if legacy_is_date_in_range(legacy_text_to_formatted_date(text), search_dates_range)])
+
+
+def run_engine(corpus: list, search_dates_range: dict) -> int:
+    parser = DateParser()
+    date_range = DateRange.from_search_dates_range(search_dates_range)
+    dates = [parser.parse(text) for text in corpus]
+    return len([date for date in dates if date in date_range])
+
+
+def main():
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpus = build_corpus(corpus_size)
+    today = datetime.date.today()
+    search_dates_range = {"start_date": today.replace(year=today.year - 1, day=1).strftime('%m/%d/%Y'), "end_date": today.strftime('%m/%d/%Y')}
+
+    results = {"corpus_size": corpus_size}
+    for name, func in (("legacy", run_legacy), ("engine", run_engine)):
+        seconds = min(timeit.repeat(lambda: func(corpus, search_dates_range), number=1, repeat=3))
+        results[name] = {"seconds": round(seconds, 4), "kept": func(corpus, search_dates_range)}
+    results["speedup"] = round(results["legacy"]["seconds"] / results["engine"]["seconds"], 1)
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
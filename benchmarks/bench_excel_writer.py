@@ -0,0 +1,70 @@
+"""
+Benchmark of the streaming Excel writer against the in-memory `ExcelHandler.create_excel`.
+
+Writes synthetic article rows and reports wall time and peak Python memory (tracemalloc)
+for each writer.
+
+Usage:
+    python benchmarks/bench_excel_writer.py [row_count ...]
+"""
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from src.excel_handler import ExcelHandler
+
+
+def synthetic_articles(count: int):
+    """Yield `count` article records shaped like the ones `extract_articles` produces."""
+    start = datetime.date(2023, 1, 1)
+    for index in range(count):
+        yield {
+            "title": f"Article title number {index} about the World Cup",
+            "date": start + datetime.timedelta(days=index % 365),
+            "description": "A description of the article that is about as long as the ones NYT shows on search results. " * 2,
+            "picture_filename": f"{index:032x}.jpg",
+            "contains_money_format_on_title_or_description": index % 7 == 0,
+            "count_search_phrases": index % 3,
+        }
+
+
+def measure(func) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 3), "peak_mb": round(peak / 1024 / 1024, 1)}
+
+
+def run_in_memory(count: int, output_path: str):
+    ExcelHandler().create_excel(list(synthetic_articles(count)), output_path)
+
+
+def run_streaming(count: int, output_path: str):
+    with ExcelHandler().open_writer(output_path) as writer:
+        for article in synthetic_articles(count):
+            writer.write(article)
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in row_counts:
+            for name, func in (("in_memory", run_in_memory), ("streaming", run_streaming)):
+                output_path = os.path.join(directory, f"{name}_{count}.xlsx")
+                results.append({"writer": name, "rows": count, **measure(lambda: func(count, output_path))})
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark of the lean browser profile against the default one on the local fixture server.
+
+For each profile, a new headless browser opens the fixture search page and loads a few
+"SHOW MORE" batches. Reported per profile:
+- page_ready: seconds from navigating to the search URL until the results are rendered
+- show_more: seconds to load the extra batches
+- requests / bytes_sent: what the fixture server served for the page and its batches
+
+The default profile loads the images, ad and analytics scripts, web font and video the
+fixture page references; the lean one (`browser.lean` in config.json) should skip them.
+
+Usage:
+    python benchmarks/bench_lean_profile.py [--batches 5] [--output results.json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.fixture_server import FixtureServer
+
+
+def bench_profile(lean: bool, batches: int) -> dict:
+    from RPA.Browser.Selenium import Selenium
+    from src.nyt_pages import SearchResultsPage
+
+    payload = {"search_phrase": "fifa", "news_categories": ["Sports"], "number_of_months": 12}
+    browser = Selenium()
+    with FixtureServer(100 + 10 * batches) as fixture_server, tempfile.TemporaryDirectory() as output_directory:
+        try:
+            page = SearchResultsPage(browser, payload=payload, output_directory=output_directory)
+            browser_config = page.config.get("browser", {})
+            lean_profile = dict(browser_config.get("lean", {}), enabled=lean)
+            config = dict(page.config, browser=dict(browser_config, headless=True, attach_port=None, profile_path=None, lean=lean_profile))
+            page.load_config = lambda filename="config.json": config
+            page.base_url = fixture_server.url
+            # open_the_website logs and swallows a failed browser start; stop here rather than fail later with NoOpenBrowser
+            if not page.open_the_website("about:blank"):
+                raise RuntimeError("Could not start a headless Chrome; this benchmark needs Chrome or Chromium installed")
+
+            requests, bytes_sent = fixture_server.requests, fixture_server.bytes_sent
+            started = time.perf_counter()
+            browser.go_to(page.build_search_url())
+            page.waiter.wait_for_count(page.root_div_elements_css, 0, page.waiter.timeout("results_batch"))
+            page_ready = time.perf_counter() - started
+
+            started = time.perf_counter()
+            page.close_modals()
+            for _ in range(batches):
+                if not page.load_more_articles(len(browser.find_elements(page.root_div_elements_css))):
+                    break
+            show_more = time.perf_counter() - started
+
+            return {
+                "page_ready": round(page_ready, 4),
+                "show_more": round(show_more, 4),
+                "requests": fixture_server.requests - requests,
+                "bytes_sent": fixture_server.bytes_sent - bytes_sent,
+            }
+        finally:
+            browser.close_all_browsers()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=5, help='"SHOW MORE" batches to load after the first page')
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = {"batches": args.batches}
+    for name, lean in (("default", False), ("lean", True)):
+        results[name] = bench_profile(lean, args.batches)
+        print(f"Finished {name}", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
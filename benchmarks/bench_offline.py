@@ -0,0 +1,173 @@
+"""
+Offline benchmark suite: times each stage of a run against the local fixture server.
+
+Stages, measured separately for every result size:
+- apply_filters / extract_articles / extract_articles_async (`run_mode` "async"): a headless browser against the fixture search page (needs Chrome; skip with --no-browser)
+- image_downloads: ImageDownloader fetching every fixture image from its `src`, without the cache
+- image_downloads_by_width: the same with the rendition picked from `srcset` by `image_downloads.max_image_width`
+- date_analytics: parsing every article date and checking it against the search range
+- text_analytics: money detection and phrase counting on every article
+- create_excel: ExcelHandler.create_excel and the streaming writer
+
+Results are printed (or written with --output) as JSON, tagged with the git revision, so
+runs of different versions can be compared.
+
+Usage:
+    python benchmarks/bench_offline.py [--sizes 100 1000 10000] [--no-browser] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.fixture_server import FixtureServer
+from src.article_index import ArticleIndex
+from src.date_engine import DateParser, DateRange
+from src.excel_handler import ExcelHandler
+from src.image_downloader import ImageDownloader
+from src.output_sinks import MemorySink
+from src.text_analyzer import TextAnalyzer
+from src.utility import Utility
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return round(time.perf_counter() - started, 4), result
+
+
+def bench_browser(fixture_server: FixtureServer, output_directory: str) -> dict:
+    from RPA.Browser.Selenium import Selenium
+    from src.nyt_pages import SearchResultsPage
+
+    payload = {"search_phrase": "fifa", "news_categories": ["Sports", "World"], "number_of_months": 12}
+    browser = Selenium()
+    try:
+        page = SearchResultsPage(browser, payload=payload, output_directory=output_directory)
+        page.base_url = fixture_server.url
+        page.image_cache = None
+        # Keep the fixture articles out of the real article index and checkpoints
+        if page.article_index:
+            page.article_index.close()
+        page.article_index = ArticleIndex(os.path.join(output_directory, "article_index.sqlite"))
+        page.checkpoint_config = dict(page.checkpoint_config, directory=os.path.join(output_directory, "checkpoints"))
+        browser.open_available_browser(fixture_server.url, headless=True)
+
+        apply_seconds, _ = timed(page.apply_filters)
+        sink = MemorySink()
+        extract_seconds, _ = timed(lambda: page.extract_articles(writer=sink))
+
+        page.run_mode = "async"
+        page.apply_filters()
+        async_sink = MemorySink()
+        async_seconds, _ = timed(lambda: page.extract_articles(writer=async_sink))
+        return {
+            "apply_filters": {"seconds": apply_seconds},
+            "extract_articles": {"seconds": extract_seconds, "articles": sink.rows_written},
+            "extract_articles_async": {"seconds": async_seconds, "articles": async_sink.rows_written},
+        }
+    finally:
+        browser.close_all_browsers()
+
+
+def bench_image_downloads(fixture_server: FixtureServer, output_directory: str, max_image_width=None) -> dict:
+    urls = []
+    for article in fixture_server.articles:
+        src = fixture_server.image_url(article["image"])
+        srcset = f"{src}?w=150 150w, {src}?w=600 600w"
+        urls.append(Utility.select_image_rendition(src, srcset, max_image_width)[0])
+
+    bytes_sent = fixture_server.bytes_sent
+    with ImageDownloader(output_directory) as downloader:
+        seconds, filenames = timed(lambda: [future.result() for future in [downloader.submit(url) for url in urls]])
+    return {
+        "seconds": seconds,
+        "images": len([filename for filename in filenames if filename]),
+        "bytes": fixture_server.bytes_sent - bytes_sent,
+    }
+
+
+def bench_date_analytics(fixture_server: FixtureServer) -> dict:
+    date_range = DateRange.from_search_dates_range(Utility(None).calculate_search_dates_range(12))
+    parser = DateParser()
+    seconds, kept = timed(lambda: len([1 for article in fixture_server.articles if parser.parse(article["date"]) in date_range]))
+    return {"seconds": seconds, "kept": kept}
+
+
+def bench_text_analytics(fixture_server: FixtureServer) -> dict:
+    analyzer = TextAnalyzer(["fifa", "world cup", "qatar"])
+    seconds, results = timed(lambda: analyzer.analyze_batch(fixture_server.articles))
+    return {"seconds": seconds, "with_money": len([1 for result in results if result["contains_money_format_on_title_or_description"]])}
+
+
+def bench_excel(fixture_server: FixtureServer, output_directory: str) -> dict:
+    parser = DateParser()
+    records = [
+        {
+            "title": article["title"],
+            "date": parser.parse(article["date"]),
+            "description": article["description"],
+            "picture_filename": f"{article['image']}.jpg",
+            "contains_money_format_on_title_or_description": False,
+            "count_search_phrases": 0,
+        }
+        for article in fixture_server.articles
+    ]
+
+    create_seconds, _ = timed(lambda: ExcelHandler().create_excel(records, os.path.join(output_directory, "create_excel.xlsx")))
+
+    def stream():
+        with ExcelHandler().open_writer(os.path.join(output_directory, "streaming.xlsx")) as writer:
+            for record in records:
+                writer.write(record)
+
+    stream_seconds, _ = timed(stream)
+    return {"create_excel": {"seconds": create_seconds}, "streaming_writer": {"seconds": stream_seconds}}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--no-browser", action="store_true", help="skip the stages that need a browser")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = {"revision": git_revision(), "python": platform.python_version(), "runs": []}
+    for size in args.sizes:
+        with FixtureServer(size) as fixture_server, tempfile.TemporaryDirectory() as output_directory:
+            run = {"articles": size}
+            if not args.no_browser:
+                run.update(bench_browser(fixture_server, output_directory))
+            run["image_downloads"] = bench_image_downloads(fixture_server, output_directory)
+            with open("config.json", "r") as file:
+                max_image_width = json.load(file).get("image_downloads", {}).get("max_image_width")
+            run["image_downloads_by_width"] = bench_image_downloads(fixture_server, output_directory, max_image_width)
+            run["date_analytics"] = bench_date_analytics(fixture_server)
+            run["text_analytics"] = bench_text_analytics(fixture_server)
+            run.update(bench_excel(fixture_server, output_directory))
+            run["server"] = {"requests": fixture_server.requests, "bytes_sent": fixture_server.bytes_sent}
+            results["runs"].append(run)
+            print(f"Finished {size} articles", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark of the streaming extraction stages in `src/pipeline.py`, without a browser.
+
+Feeds raw articles generated like the fixture server's into the same chain of stages
+`SearchResultsPage.build_pipeline` uses (the browser locate stage replaced by the generated
+list), with images fetched from the local fixture server and the result written to a CSV
+sink. For every size it reports:
+- the cumulative seconds of the chain up to each stage, so each stage's own cost is the
+  difference with the previous one
+- the peak memory of the full run (tracemalloc), which should stay flat as the size grows
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, ".")
+
+from benchmarks.fixture_server import FixtureServer
+from src.date_engine import DateParser, DateRange
+from src.image_downloader import ImageDownloader
+from src.output_sinks import CsvSink
+from src.pipeline import enrich_articles, fetch_images, filter_by_date, parse_articles
+from src.text_analyzer import TextAnalyzer
+from src.utility import Utility, metrics
+
+STAGES = ["parse", "filter_by_date", "enrich", "fetch_images"]
+
+
+def raw_articles(fixture_server: FixtureServer):
+    """Yield the fixture articles in the shape the locate stage produces."""
+    for article in fixture_server.articles:
+        image_url = fixture_server.image_url(article["image"])
+        yield {
+            "date": article["date"],
+            "title": article["title"],
+            "description": article["description"],
+            "image_url": image_url,
+            "image_srcset": f"{image_url}?w=150 150w, {image_url}?w=600 600w",
+        }
+
+
+def build(fixture_server: FixtureServer, downloader: ImageDownloader, last_stage: str):
+    """Chain the stages up to and including `last_stage`."""
+    date_range = DateRange.from_search_dates_range(Utility(None).calculate_search_dates_range(12))
+    articles = parse_articles(raw_articles(fixture_server), DateParser(), max_image_width=600)
+    if last_stage == "parse":
+        return articles
+    articles = filter_by_date(articles, date_range)
+    if last_stage == "filter_by_date":
+        return articles
+    articles = enrich_articles(articles, TextAnalyzer(["fifa", "world cup"]), "fifa", ["world cup"])
+    if last_stage == "enrich":
+        return articles
+    return fetch_images(articles, downloader)
+
+
+def run_size(size: int) -> dict:
+    result = {"articles": size, "cumulative_seconds": {}}
+    with FixtureServer(size) as fixture_server, tempfile.TemporaryDirectory() as output_directory:
+        for stage in STAGES:
+            with ImageDownloader(output_directory) as downloader:
+                started = time.perf_counter()
+                # Drain the chain without keeping the articles
+                deque(build(fixture_server, downloader, stage), maxlen=0)
+                result["cumulative_seconds"][stage] = round(time.perf_counter() - started, 4)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        with ImageDownloader(output_directory) as downloader, CsvSink(os.path.join(output_directory, "articles.csv"), ["world cup"]) as sink:
+            for article in build(fixture_server, downloader, "fetch_images"):
+                sink.write(article)
+        result["full_run"] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "rows": sink.rows_written,
+            "peak_memory_mb": round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2),
+        }
+        tracemalloc.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    # As in a run without `metrics.chrome_trace`
+    metrics.keep_spans = False
+    results = {"runs": []}
+    for size in args.sizes:
+        results["runs"].append(run_size(size))
+        print(f"Finished {size} articles", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
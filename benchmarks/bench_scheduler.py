@@ -0,0 +1,78 @@
+"""
+Benchmark of the adaptive request scheduler (`src/request_scheduler.py`) against throttling.
+
+Downloads the fixture images from a local server that throttles like a CDN under load
+(`CdnThrottle`: 429s above a request rate, added latency above a concurrency, a share of
+503s), once for every downloader setup:
+- unscheduled: every request sent once, as it comes, as before the scheduler
+- scheduled: the scheduler with the `config.json` defaults, no rate configured
+- scheduled_with_rate: the scheduler capped at the server's rate from the start
+
+For each it reports the seconds, the images saved and lost, the achieved images per second,
+the responses the server sent per status, and the scheduler's counters and final limits.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--images 2000] [--workers 32] [--server-rate 300] [--output results.json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.fixture_server import CdnThrottle, FixtureServer
+from src.image_downloader import ImageDownloader
+from src.request_scheduler import RequestScheduler
+
+
+def run(image_count: int, workers: int, server_rate: float, scheduler_options) -> dict:
+    throttle = CdnThrottle(rate=server_rate)
+    with FixtureServer(image_count, throttle=throttle) as fixture_server, tempfile.TemporaryDirectory() as output_directory:
+        scheduler = RequestScheduler(max_concurrency=workers, **scheduler_options) if scheduler_options is not None else None
+        with ImageDownloader(output_directory, max_workers=workers, scheduler=scheduler) as downloader:
+            started = time.perf_counter()
+            futures = [downloader.submit(f"{fixture_server.image_url(index)}?w=150") for index in range(image_count)]
+            filenames = [future.result() for future in futures]
+            seconds = time.perf_counter() - started
+    saved = sum(1 for filename in filenames if filename)
+    result = {
+        "seconds": round(seconds, 3),
+        "images_saved": saved,
+        "images_lost": image_count - saved,
+        "images_per_second": round(saved / seconds, 1),
+        "server_responses": {str(status): count for status, count in throttle.responses.items()},
+    }
+    if scheduler:
+        result["scheduler"] = scheduler.stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--server-rate", type=float, default=300, help="image requests per second the server accepts")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    setups = {
+        "unscheduled": None,
+        "scheduled": {},
+        "scheduled_with_rate": {"rate": args.server_rate},
+    }
+    results = {"images": args.images, "workers": args.workers, "server_rate": args.server_rate, "runs": {}}
+    for name, scheduler_options in setups.items():
+        results["runs"][name] = run(args.images, args.workers, args.server_rate, scheduler_options)
+        print(f"Finished {name}", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Startup benchmark: time from process launch to the first search results on the page.
+
+Each measurement runs in a fresh Python process against the local fixture server and
+reports, relative to the moment the process was launched:
+- imports: `src.nyt_pages` and the Selenium library are imported
+- browser_open: `open_the_website` returned
+- first_results: filters applied and the first batch of results rendered
+
+Browser sessions compared:
+- cold: a new browser with a fresh profile, as by default
+- persistent_profile: a profile directory kept between runs (the first run warms it up and is not reported)
+- attach: attaching to a Chrome started with --remote-debugging-port (only with --attach-port)
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3] [--no-browser] [--attach-port 9222] [--output results.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.fixture_server import FixtureServer
+
+
+def child(launched: float, url: str, browser_config: dict, no_browser: bool):
+    """Measure one startup; runs in the launched process and prints the timings as JSON."""
+    timings = {}
+    from RPA.Browser.Selenium import Selenium
+    from src.nyt_pages import SearchResultsPage
+    timings["imports"] = time.time() - launched
+    if no_browser:
+        print(json.dumps(timings))
+        return
+
+    browser = Selenium()
+    try:
+        payload = {"search_phrase": "fifa", "news_categories": ["Sports"], "number_of_months": 12}
+        with tempfile.TemporaryDirectory() as output_directory:
+            page = SearchResultsPage(browser, payload=payload, output_directory=output_directory)
+            config = dict(page.config, browser=dict(page.config.get("browser", {}), headless=True, **browser_config))
+            page.load_config = lambda filename="config.json": config
+            page.base_url = url
+
+            page.open_the_website(url)
+            timings["browser_open"] = time.time() - launched
+
+            page.apply_filters()
+            page.waiter.wait_for_count(page.root_div_elements_css, 0, page.waiter.timeout("results_batch"))
+            timings["first_results"] = time.time() - launched
+    finally:
+        # An attached browser belongs to someone else; only quit the ones started here
+        if not browser_config.get("attach_port"):
+            browser.close_all_browsers()
+
+    print(json.dumps(timings))
+
+
+def measure(url: str, browser_config: dict, no_browser: bool) -> dict:
+    launched = time.time()
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", str(launched), url, json.dumps(browser_config)] + (["--no-browser"] if no_browser else []),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    return {stage: round(statistics.median(sample[stage] for sample in samples), 3) for stage in samples[0]}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(float(sys.argv[2]), sys.argv[3], json.loads(sys.argv[4]), "--no-browser" in sys.argv)
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="measurements per session type; the median is reported")
+    parser.add_argument("--no-browser", action="store_true", help="only measure the imports")
+    parser.add_argument("--attach-port", type=int, help="also measure attaching to a Chrome on this remote debugging port")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = {"runs": args.runs}
+    with FixtureServer(100) as fixture_server, tempfile.TemporaryDirectory() as profile_path:
+        sessions = {"cold": {}}
+        if not args.no_browser:
+            sessions["persistent_profile"] = {"profile_path": profile_path}
+            if args.attach_port:
+                sessions["attach"] = {"attach_port": args.attach_port}
+
+        for name, browser_config in sessions.items():
+            if name == "persistent_profile":
+                measure(fixture_server.url, browser_config, args.no_browser)
+            results[name] = summarize([measure(fixture_server.url, browser_config, args.no_browser) for _ in range(args.runs)])
+            print(f"Finished {name}", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Local HTTP server that mimics the NYT search results page for offline benchmarks.
+
+Serves a search page whose markup matches the selectors in `config.json`: the consent
+modals, the category multiselect, the sort select, the result list and a "SHOW MORE"
+button that appends the next batch of results. The articles are generated from a fixed
+seed, so every run serves the same results, with NYT-style dates ("5h ago", "Sept. 3",
+"March 2, 2021") spread newest first over the last year. Like the real page, it also pulls
+non-essential resources (an ad script, analytics, a web font and a video) under the paths
+in `THIRD_PARTY_ASSETS`; the ad script is slow to respond and blocks parsing. With a
+`CdnThrottle`, the images are served like from a CDN under load (see its docstring).
+
+Usage:
+    python benchmarks/fixture_server.py [article_count] [port]
+"""
+import datetime
+import html
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MONTH_LABELS = ["Jan.", "Feb.", "March", "April", "May", "June", "July", "Aug.", "Sept.", "Oct.", "Nov.", "Dec."]
+CATEGORIES = {"Arts": 120, "Business": 340, "Opinion": 80, "Sports": 910, "World": 450}
+WORDS = ["world", "cup", "fifa", "qatar", "match", "goal", "team", "coach", "fans", "stadium", "$1.5 million", "league", "final", "season"]
+BATCH_SIZE = 10
+# Path: (content type, size in bytes, response delay in seconds)
+THIRD_PARTY_ASSETS = {
+    "/ads/gpt.js": ("application/javascript", 250_000, 0.3),
+    "/analytics/track.js": ("application/javascript", 60_000, 0.1),
+    "/fonts/cheltenham.woff2": ("font/woff2", 120_000, 0),
+    "/video/promo.mp4": ("video/mp4", 1_500_000, 0),
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>Search - The New York Times</title>
+<link rel="preload" href="/fonts/cheltenham.woff2" as="font" type="font/woff2" crossorigin>
+<script src="/ads/gpt.js"></script>
+<script async src="/analytics/track.js"></script>
+</head>
+<body>
+<video src="/video/promo.mp4" preload="auto" muted></video>
+<div id="modals">
+  <div id="terms-modal"><button class="{terms_class}">Continue</button></div>
+  <div id="gdpr-modal"><button data-testid="GDPR-accept">Accept</button></div>
+</div>
+<div id="site-content"><div>
+  <div>
+    <div>
+      <div>
+        <button data-testid="search-multiselect-button">Section</button>
+        <ul data-testid="multi-select-dropdown-list">{categories}</ul>
+      </div>
+      <select data-testid="SearchForm-sortBy"><option value="best">Relevance</option><option value="newest">Newest</option><option value="oldest">Oldest</option></select>
+    </div>
+  </div>
+  <div>
+    <div><p>Showing {total} results for: {query}</p></div>
+    <div>
+      <ol data-testid="search-results">{articles}</ol>
+      <div><button data-testid="search-show-more-button">Show More</button></div>
+    </div>
+  </div>
+</div></div>
+<script>
+  document.querySelectorAll('#modals button').forEach(function (button) {{
+    button.addEventListener('click', function () {{ button.parentNode.remove(); }});
+  }});
+  var loaded = {loaded};
+  var button = document.querySelector('[data-testid="search-show-more-button"]');
+  button.addEventListener('click', function () {{
+    fetch('/api/articles?offset=' + loaded + '&count={batch_size}').then(function (response) {{ return response.text(); }}).then(function (fragment) {{
+      document.querySelector('[data-testid="search-results"]').insertAdjacentHTML('beforeend', fragment);
+      loaded += {batch_size};
+      if (loaded >= {total}) {{ button.parentNode.remove(); }}
+    }});
+  }});
+</script>
+</body></html>
+"""
+
+ARTICLE_TEMPLATE = """<li><div class="{root_class}">
+  <span class="css-{date_locator}">{date}</span>
+  <div><a href="/article/{index}"><h4 class="css-{title_locator}">{title}</h4></a>
+  <p class="css-{description_locator}">{description}</p></div>
+  <figure><img class="css-{image_locator}" src="{image_url}" srcset="{image_url}?w=150 150w, {image_url}?w=600 600w" alt=""></figure>
+</div></li>"""
+
+
+def format_nyt_date(date: datetime.date, today: datetime.date, index: int) -> str:
+    """Format a date the way NYT search results show it."""
+    if date == today:
+        return f"{index % 23 + 1}h ago"
+    label = f"{MONTH_LABELS[date.month - 1]} {date.day}"
+    return label if date.year == today.year else f"{label}, {date.year}"
+
+
+def generate_articles(count: int, days: int = 365, seed: int = 0) -> list:
+    """
+    Generate `count` raw articles, newest first, spread over the last `days` days.
+
+    Returns:
+    - list: Dictionaries with `date`, `title`, `description` and `image` (image number) keys.
+    """
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    articles = []
+    for index in range(count):
+        date = today - datetime.timedelta(days=index * days // max(count, 1))
+        articles.append({
+            "date": format_nyt_date(date, today, index),
+            "title": " ".join(rng.choice(WORDS) for _ in range(8)).capitalize(),
+            "description": " ".join(rng.choice(WORDS) for _ in range(25)).capitalize() + ".",
+            "image": index,
+        })
+    return articles
+
+
+# Bytes served per image rendition: `src` points at the full-size image, `srcset` lists the smaller ones
+RENDITION_BYTES = {None: 96_000, 150: 4_096, 600: 32_000}
+
+
+class CdnThrottle:
+    """
+    Makes the image responses behave like a CDN that protects itself from heavy clients.
+
+    - Above `rate` image requests per second (with `burst` saved up), requests get a 429 with a
+      `Retry-After` of `retry_after` seconds.
+    - Above `slow_concurrency` image requests at once, each response is delayed by `slow_delay`
+      seconds per extra request, so pushing more concurrency only adds latency.
+    - A seeded `error_rate` fraction of the admitted requests fails with a 503.
+
+    Args:
+    - rate (float): Image requests per second served.
+    - burst (int): Requests the server lets through at once after a quiet period.
+    - slow_concurrency (int): Concurrent image requests served without added latency.
+    - slow_delay (float): Added seconds per concurrent request above `slow_concurrency`.
+    - error_rate (float): Fraction of admitted requests answered with a 503.
+    - retry_after (int): The `Retry-After` of the 429 responses, None to leave it out.
+    - seed (int): Seed of the 503 draws.
+    """
+
+    def __init__(self, rate: float = 300, burst: int = 20, slow_concurrency: int = 16, slow_delay: float = 0.01,
+                 error_rate: float = 0.02, retry_after: int = 1, seed: int = 0):
+        self.rate = rate
+        self.burst = burst
+        self.slow_concurrency = slow_concurrency
+        self.slow_delay = slow_delay
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.responses = {200: 0, 429: 0, 503: 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def enter(self) -> tuple:
+        """
+        Admit an image request.
+
+        Returns:
+        - tuple: The status to answer with and the seconds to wait before answering.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.in_flight += 1
+            if self.tokens < 1:
+                status = 429
+            else:
+                self.tokens -= 1
+                status = 503 if self._rng.random() < self.error_rate else 200
+            self.responses[status] += 1
+            return status, max(0, self.in_flight - self.slow_concurrency) * self.slow_delay
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+def fixture_image(index: int, size: int = 4096) -> bytes:
+    """Deterministic image-sized payload for an image number."""
+    return (b"\xff\xd8\xff\xe0" + index.to_bytes(4, "big") * (size // 4))[:size]
+
+
+class FixtureServer:
+    """
+    Serves the fixture search page on 127.0.0.1 from a background thread.
+
+    Args:
+    - article_count (int): Total number of search results.
+    - port (int): Port to listen on, 0 for any free port.
+    - config_path (str): The config.json the selectors are read from.
+    - throttle (CdnThrottle): Optional throttling of the image responses.
+    """
+
+    def __init__(self, article_count: int = 100, port: int = 0, config_path: str = "config.json", throttle: CdnThrottle = None):
+        with open(config_path, "r") as file:
+            self.selectors = json.load(file)["selectors"]
+        self.article_count = article_count
+        self.throttle = throttle
+        self.articles = generate_articles(article_count)
+        self.requests = 0
+        self.bytes_sent = 0
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/"
+
+    def image_url(self, index: int) -> str:
+        return f"{self.url}images/{index}.jpg"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def render_articles(self, offset: int, count: int) -> str:
+        root_class = self.selectors["root_div_elements_css"].split(".", 1)[1]
+        return "".join(
+            ARTICLE_TEMPLATE.format(
+                root_class=root_class,
+                date_locator=self.selectors["date_locator"],
+                title_locator=self.selectors["title_locator"],
+                description_locator=self.selectors["description_locator"],
+                image_locator=self.selectors["image_locator"],
+                index=article["image"],
+                date=html.escape(article["date"]),
+                title=html.escape(article["title"]),
+                description=html.escape(article["description"]),
+                image_url=self.image_url(article["image"]),
+            )
+            for article in self.articles[offset:offset + count]
+        )
+
+    def render_page(self, query: str) -> str:
+        terms_class = re.search(r"@class='([^']+)'", self.selectors["terms_update_acceptance_selector"]).group(1)
+        categories = "".join(
+            f'<li><label><input type="checkbox" value="{name}"><span>{name}{count}</span></label></li>'
+            for name, count in {"Any": self.article_count, **CATEGORIES}.items()
+        )
+        return PAGE_TEMPLATE.format(
+            terms_class=terms_class,
+            categories=categories,
+            total=self.article_count,
+            query=html.escape(query),
+            articles=self.render_articles(0, BATCH_SIZE),
+            loaded=min(BATCH_SIZE, self.article_count),
+            batch_size=BATCH_SIZE,
+        )
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, keep-alive clients wait on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                if parts.path in THIRD_PARTY_ASSETS:
+                    content_type, size, delay = THIRD_PARTY_ASSETS[parts.path]
+                    time.sleep(delay)
+                    body = (b"/* filler */\n" * (size // 13 + 1))[:size]
+                elif parts.path.startswith("/images/") and server.throttle:
+                    self.send_throttled_image(parts.path, query)
+                    return
+                elif parts.path.startswith("/images/"):
+                    width = int(query["w"][0]) if "w" in query else None
+                    size = RENDITION_BYTES.get(width, RENDITION_BYTES[None])
+                    body, content_type = fixture_image(int(re.sub(r"\D", "", parts.path) or 0), size), "image/jpeg"
+                elif parts.path == "/api/articles":
+                    offset, count = int(query.get("offset", ["0"])[0]), int(query.get("count", [str(BATCH_SIZE)])[0])
+                    body, content_type = server.render_articles(offset, count).encode(), "text/html; charset=utf-8"
+                elif parts.path in ("/", "/search"):
+                    body, content_type = server.render_page(query.get("query", [""])[0]).encode(), "text/html; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+
+                server.requests += 1
+                server.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_throttled_image(self, path, query):
+                status, delay = server.throttle.enter()
+                try:
+                    time.sleep(delay)
+                    if status != 200:
+                        self.send_response(status)
+                        if status == 429 and server.throttle.retry_after is not None:
+                            self.send_header("Retry-After", str(server.throttle.retry_after))
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    width = int(query["w"][0]) if "w" in query else None
+                    body = fixture_image(int(re.sub(r"\D", "", path) or 0), RENDITION_BYTES.get(width, RENDITION_BYTES[None]))
+                    server.requests += 1
+                    server.bytes_sent += len(body)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/jpeg")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    server.throttle.leave()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ".")
+    article_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    with FixtureServer(article_count, port) as fixture_server:
+        print(f"Serving {article_count} fixture articles on {fixture_server.url}")
+        threading.Event().wait()
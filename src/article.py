@@ -0,0 +1,61 @@
+import datetime
+
+
+class Article:
+    """
+    One search result as it moves through the extraction pipeline.
+
+    A slotted record, so the articles in flight between stages stay small. It also reads
+    like the dictionaries the output sinks, checkpoint and article index were written for:
+    `article["title"]`, `article.get("phrase_counts")` and `dict(article)` all work.
+    """
+
+    __slots__ = (
+        "date",
+        "title",
+        "description",
+        "image_url",
+        "picture_filename",
+        "picture_width",
+        "contains_money_format_on_title_or_description",
+        "count_search_phrases",
+        "phrase_counts",
+    )
+
+    def __init__(
+        self,
+        date: datetime.date,
+        title: str,
+        description: str,
+        image_url: str = "",
+        picture_filename=None,
+        picture_width: int = None,
+        contains_money_format_on_title_or_description: bool = False,
+        count_search_phrases: int = 0,
+        phrase_counts: dict = None,
+    ):
+        self.date = date
+        self.title = title
+        self.description = description
+        self.image_url = image_url
+        # A Future while the image downloads, the saved filename ('' if there is none) afterwards
+        self.picture_filename = picture_filename
+        self.picture_width = picture_width
+        self.contains_money_format_on_title_or_description = contains_money_format_on_title_or_description
+        self.count_search_phrases = count_search_phrases
+        self.phrase_counts = phrase_counts if phrase_counts is not None else {}
+
+    def keys(self) -> tuple:
+        return self.__slots__
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self) -> str:
+        return f"Article(date={self.date!r}, title={self.title!r})"
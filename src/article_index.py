@@ -0,0 +1,202 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+
+
+def search_key(search_phrase: str, news_categories: list) -> str:
+    """
+    Identify a search by its phrase and categories, independently of case and category order.
+
+    Args:
+    - search_phrase (str): The search phrase.
+    - news_categories (list): The categories.
+
+    Returns:
+    - str: The key.
+    """
+    search = json.dumps([search_phrase.strip().lower(), sorted(news_categories)])
+    return hashlib.sha1(search.encode()).hexdigest()
+
+
+def article_hash(date: datetime.date, title: str) -> str:
+    """Stable identifier of an article from its date and title."""
+    return hashlib.sha1(f"{date.isoformat()}|{title}".encode()).hexdigest()
+
+
+class ArticleIndex:
+    """
+    Persistent SQLite index of the articles seen by earlier runs, per search.
+
+    Stores every written article with its computed fields, picture filename and the
+    directory the picture was saved to, so a delta run can stop paginating at the first
+    article it already knows and still produce the full report. It also records the date
+    range each completed search covered: an indexed article only means everything older
+    was extracted too if a completed search covered the dates down to the new search's start.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                search_key TEXT NOT NULL,
+                article_hash TEXT NOT NULL,
+                date TEXT NOT NULL,
+                picture_directory TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (search_key, article_hash)
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS articles_by_date ON articles (search_key, date)")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS coverage (
+                search_key TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL
+            )
+            """
+        )
+
+    def contains(self, key: str, date: datetime.date, title: str) -> bool:
+        """
+        Check whether an article is already indexed for a search.
+
+        Args:
+        - key (str): The search key.
+        - date (datetime.date): The article date.
+        - title (str): The article title.
+
+        Returns:
+        - bool: True if indexed.
+        """
+        row = self.connection.execute(
+            "SELECT 1 FROM articles WHERE search_key = ? AND article_hash = ?", (key, article_hash(date, title))
+        ).fetchone()
+        return row is not None
+
+    def add(self, key: str, article: dict, picture_directory: str):
+        """
+        Index an article, replacing an earlier entry for the same article.
+
+        Args:
+        - key (str): The search key.
+        - article (dict | Article): The article record.
+        - picture_directory (str): The directory its picture was saved to.
+
+        Returns:
+        - None
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?)",
+            (
+                key,
+                article_hash(article["date"], article["title"]),
+                article["date"].isoformat(),
+                picture_directory,
+                json.dumps(dict(article), default=lambda value: value.isoformat(), ensure_ascii=False),
+            ),
+        )
+
+    def add_coverage(self, key: str, start_date: datetime.date, end_date: datetime.date):
+        """
+        Record that a search extracted all its articles within a date range; committed with the articles.
+
+        Args:
+        - key (str): The search key.
+        - start_date, end_date (datetime.date): The date range, inclusive.
+
+        Returns:
+        - None
+        """
+        self.connection.execute(
+            "INSERT INTO coverage VALUES (?, ?, ?)", (key, start_date.isoformat(), end_date.isoformat())
+        )
+
+    def covers(self, key: str, start_date: datetime.date, end_date: datetime.date) -> bool:
+        """
+        Check whether one completed search extracted every article of a search within a date range.
+
+        Args:
+        - key (str): The search key.
+        - start_date, end_date (datetime.date): The date range, inclusive.
+
+        Returns:
+        - bool: True if covered.
+        """
+        row = self.connection.execute(
+            "SELECT 1 FROM coverage WHERE search_key = ? AND start_date <= ? AND end_date >= ?",
+            (key, start_date.isoformat(), end_date.isoformat()),
+        ).fetchone()
+        return row is not None
+
+    def commit(self):
+        """Persist the articles added since the last commit, once their search has completed."""
+        self.connection.commit()
+
+    def rollback(self):
+        """
+        Drop the articles added since the last commit.
+
+        Used when a search is interrupted: a partially indexed search would make the next
+        delta run stop paginating before the articles that were never reached.
+        """
+        self.connection.rollback()
+
+    def articles(self, key: str, start_date: datetime.date, end_date: datetime.date, exclude=()):
+        """
+        Yield the indexed articles of a search within a date range, newest first.
+
+        Args:
+        - key (str): The search key.
+        - start_date, end_date (datetime.date): The date range, inclusive.
+        - exclude (set): Article hashes to leave out, e.g. the ones written by the current run.
+
+        Yields:
+        - tuple: The article record and the directory its picture was saved to.
+        """
+        rows = self.connection.execute(
+            "SELECT article_hash, picture_directory, record FROM articles WHERE search_key = ? AND date BETWEEN ? AND ? ORDER BY date DESC",
+            (key, start_date.isoformat(), end_date.isoformat()),
+        )
+        for hash_, picture_directory, record in rows:
+            if hash_ in exclude:
+                continue
+            article = json.loads(record)
+            article["date"] = datetime.date.fromisoformat(article["date"])
+            yield article, picture_directory
+
+    def close(self):
+        self.connection.close()
+
+
+def bring_picture(picture_filename: str, source_directory: str, target_directory: str):
+    """
+    Make an indexed article's picture available in the current output directory.
+
+    Hard-links the file when possible and copies it otherwise.
+
+    Returns:
+    - bool: True if the picture is in the target directory afterwards.
+    """
+    if not picture_filename:
+        return False
+    source = os.path.join(source_directory, picture_filename)
+    target = os.path.join(target_directory, picture_filename)
+    if os.path.exists(target):
+        return True
+    if not os.path.exists(source):
+        return False
+    os.makedirs(target_directory, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+    return True
@@ -0,0 +1,89 @@
+"""
+Asyncio run mode of the article extraction (`"run_mode": "async"` in config.json).
+
+Three tasks run concurrently, connected by bounded queues:
+- load: pulls raw "SHOW MORE" batches from the browser. It clicks for the next batch as soon
+  as the current one is handed over, rather than after it has been processed.
+- process: parses, filters and enriches each batch with the same stages as the synchronous
+  pipeline, and queues the image downloads.
+- write: writes each article as soon as its image is saved, in the order the results came in.
+
+The WebDriver session is not thread-safe, so every blocking browser call runs on one
+dedicated thread. The image downloads keep running on the ImageDownloader's pool. The
+bounded queues give backpressure: the browser stays at most `batches_ahead` batches ahead,
+and at most `image_downloads.max_in_flight` articles wait for their image.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utility import metrics
+
+# Marks the end of a queue
+_DONE = object()
+
+
+async def extract_articles_async(page, image_downloader, writer, batches_ahead: int = 2):
+    """
+    Extract the search results of `page` with loading, processing and writing overlapped.
+
+    Args:
+    - page (SearchResultsPage): The page, with its search loaded and the filters applied.
+    - image_downloader (ImageDownloader): The downloader the image URLs are handed to.
+    - writer (OutputSink): The output writer.
+    - batches_ahead (int): The most batches loaded but not yet processed.
+
+    Returns:
+    - None
+    """
+    raw_batches = asyncio.Queue(maxsize=batches_ahead)
+    pending_articles = asyncio.Queue(maxsize=page.image_downloads_config.get("max_in_flight", 32))
+    browser_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+    try:
+        # If a task fails, gather raises and asyncio.run cancels the others
+        await asyncio.gather(
+            load_batches(page, browser_thread, raw_batches),
+            process_batches(page, image_downloader, raw_batches, pending_articles),
+            write_articles(page, writer, pending_articles),
+        )
+    finally:
+        browser_thread.shutdown(wait=True)
+
+
+async def load_batches(page, browser_thread, raw_batches: asyncio.Queue):
+    """Load task: run the page's batch generator on the browser thread and queue each batch."""
+    loop = asyncio.get_running_loop()
+    batches = page.iter_raw_batches()
+    while True:
+        # Resuming the generator checks whether to stop, clicks "SHOW MORE" and reads the new batch
+        raw_articles = await loop.run_in_executor(browser_thread, next, batches, _DONE)
+        if raw_articles is _DONE:
+            break
+        metrics.increment("batches_loaded")
+        await raw_batches.put(raw_articles)
+    await raw_batches.put(_DONE)
+
+
+async def process_batches(page, image_downloader, raw_batches: asyncio.Queue, pending_articles: asyncio.Queue):
+    """Process task: run the parse, date filter, skip and enrich stages on each batch and start its downloads."""
+    while True:
+        raw_articles = await raw_batches.get()
+        if raw_articles is _DONE:
+            break
+        for article in page.prepare_articles(raw_articles):
+            article.picture_filename = asyncio.wrap_future(image_downloader.submit(article.image_url))
+            await pending_articles.put(article)
+    await pending_articles.put(_DONE)
+
+
+async def write_articles(page, writer, pending_articles: asyncio.Queue):
+    """Write task: wait for each article's image and write it to the output."""
+    while True:
+        article = await pending_articles.get()
+        if article is _DONE:
+            break
+        try:
+            article.picture_filename = await article.picture_filename
+        except Exception as e:
+            print(f"Error when saving the image of {article.title!r}. Original error: {str(e)}")
+            article.picture_filename = ''
+        page.output_article(article, writer)
@@ -0,0 +1,98 @@
+import datetime
+import hashlib
+import json
+import os
+
+
+def article_key(article: dict) -> tuple:
+    """
+    Identify an article by its date, title and description.
+
+    Args:
+    - article (dict): The article record.
+
+    Returns:
+    - tuple: The key.
+    """
+    return (article["date"], article["title"], article["description"])
+
+
+class CheckpointJournal:
+    """
+    Append-only JSON Lines journal of the articles extracted for one search.
+
+    The journal file is named after a hash of the search payload and dates range, so a
+    restarted run with the same payload finds it, replays the articles it already has and
+    skips them while paginating. Each article is journaled with the directory its picture
+    was saved to, since a restarted run usually writes to a new timestamped folder. The
+    journal is deleted once the search completes.
+    """
+
+    def __init__(self, directory: str, payload: dict, search_dates_range: dict, fsync: bool = False):
+        self.fsync = fsync
+        search = json.dumps({"payload": payload, "search_dates_range": search_dates_range}, sort_keys=True, default=str)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, hashlib.sha1(search.encode()).hexdigest() + ".jsonl")
+        self.keys = set()
+        self._file = None
+
+    def load(self) -> list:
+        """
+        Read the articles journaled by a previous, interrupted run.
+
+        Returns:
+        - list: (article record, picture directory) tuples, in the order they were extracted.
+        """
+        articles = []
+        if not os.path.exists(self.path):
+            return articles
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    article = json.loads(line)
+                except ValueError:
+                    # The last line may be cut short by the crash
+                    continue
+                picture_directory = article.pop("picture_directory", None)
+                article["date"] = datetime.date.fromisoformat(article["date"])
+                if article_key(article) not in self.keys:
+                    self.keys.add(article_key(article))
+                    articles.append((article, picture_directory))
+
+        return articles
+
+    def has(self, article: dict) -> bool:
+        """Check whether an article is already journaled."""
+        return article_key(article) in self.keys
+
+    def append(self, article: dict, picture_directory: str):
+        """
+        Journal one article, with its downloaded picture filename.
+
+        Args:
+        - article (dict | Article): The article record.
+        - picture_directory (str): The directory the article's picture was saved to.
+
+        Returns:
+        - None
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(dict(article, picture_directory=picture_directory), default=lambda value: value.isoformat(), ensure_ascii=False) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.keys.add(article_key(article))
+
+    def close(self):
+        """Close the journal file, keeping it for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self):
+        """Delete the journal once the search has finished."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
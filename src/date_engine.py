@@ -0,0 +1,138 @@
+import datetime
+import functools
+import re
+
+# Month names as NYT prints them (full names and its dotted abbreviations), lowercased.
+MONTHS = {
+    "jan.": 1, "january": 1,
+    "feb.": 2, "february": 2,
+    "mar.": 3, "march": 3,
+    "apr.": 4, "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "aug.": 8, "august": 8,
+    "sept.": 9, "september": 9,
+    "oct.": 10, "october": 10,
+    "nov.": 11, "november": 11,
+    "dec.": 12, "december": 12,
+}
+
+MONTH_DAY_YEAR_PATTERN = re.compile(r'^([A-Za-z.]+)\s+(\d{1,2}),\s*(\d{4})$')
+MONTH_DAY_PATTERN = re.compile(r'^([A-Za-z.]+)\s+(\d{1,2})$')
+HOURS_AGO_PATTERN = re.compile(r'^(\d+)h ago')
+MINUTES_AGO_PATTERN = re.compile(r'^(\d+)m ago')
+
+
+class DateParser:
+    """
+    Parses the dates shown on NYT search results ("Sept. 3", "5h ago", "March 2, 2021").
+
+    Absolute dates are memoized per (text, today) pair, so a date string seen on many
+    articles is only parsed once. Relative dates ("5h ago") depend on the current time
+    and are computed on every call.
+    """
+
+    def __init__(self, cache_size: int = 8192):
+        self._parse_absolute = functools.lru_cache(maxsize=cache_size)(self._parse_absolute_uncached)
+
+    def parse(self, date_text: str):
+        """
+        Parse a date text into a date.
+
+        Parameters:
+        - date_text: The text representation of the date.
+
+        Returns:
+        - datetime.date | None: The parsed date, or None if the text is not a known format.
+        """
+
+        if not date_text:
+            return None
+
+        hours_ago_match = HOURS_AGO_PATTERN.match(date_text)
+        if hours_ago_match:
+            return (datetime.datetime.now() - datetime.timedelta(hours=int(hours_ago_match.group(1)))).date()
+
+        minutes_ago_match = MINUTES_AGO_PATTERN.match(date_text)
+        if minutes_ago_match:
+            return (datetime.datetime.now() - datetime.timedelta(minutes=int(minutes_ago_match.group(1)))).date()
+
+        return self._parse_absolute(date_text, datetime.date.today())
+
+    def cache_info(self):
+        """Return the hit/miss statistics of the absolute date cache."""
+        return self._parse_absolute.cache_info()
+
+    @staticmethod
+    def _parse_absolute_uncached(date_text: str, today: datetime.date):
+        date_text = ' '.join(date_text.split())
+
+        match = MONTH_DAY_YEAR_PATTERN.match(date_text)
+        has_year = match is not None
+        if has_year:
+            year = int(match.group(3))
+        else:
+            match = MONTH_DAY_PATTERN.match(date_text)
+            if not match:
+                return None
+            year = today.year
+
+        month = MONTHS.get(match.group(1).lower())
+        if month is None:
+            return None
+
+        try:
+            date = datetime.date(year, month, int(match.group(2)))
+        except ValueError:
+            return None
+
+        # Dates without a year are from the last twelve months, e.g. "Dec. 28" read in January.
+        if not has_year and date > today:
+            try:
+                date = date.replace(year=year - 1)
+            except ValueError:
+                return None
+
+        return date
+
+
+class DateRange:
+    """
+    A search dates range parsed once into ordinal bounds.
+    """
+
+    __slots__ = ("start", "end", "start_ordinal", "end_ordinal")
+
+    def __init__(self, start: datetime.date, end: datetime.date):
+        self.start = start
+        self.end = end
+        self.start_ordinal = start.toordinal()
+        self.end_ordinal = end.toordinal()
+
+    @classmethod
+    def from_search_dates_range(cls, search_dates_range: dict):
+        """
+        Build a DateRange from the dictionary returned by `Utility.calculate_search_dates_range`.
+
+        Parameters:
+        - search_dates_range: Dictionary with 'start_date' and 'end_date' keys formatted as MM/DD/YYYY.
+
+        Returns:
+        - DateRange: The parsed range.
+        """
+
+        start = datetime.datetime.strptime(search_dates_range['start_date'], '%m/%d/%Y').date()
+        end = datetime.datetime.strptime(search_dates_range['end_date'], '%m/%d/%Y').date()
+        return cls(start, end)
+
+    def to_search_dates_range(self) -> dict:
+        """The inverse of `from_search_dates_range`: 'start_date' and 'end_date' formatted as MM/DD/YYYY."""
+        return {"start_date": self.start.strftime('%m/%d/%Y'), "end_date": self.end.strftime('%m/%d/%Y')}
+
+    def __contains__(self, date) -> bool:
+        return date is not None and self.start_ordinal <= date.toordinal() <= self.end_ordinal
+
+    def is_before(self, date) -> bool:
+        """Check if a date is older than the start of the range."""
+        return date is not None and date.toordinal() < self.start_ordinal
@@ -1,19 +1,29 @@
-from RPA.Excel.Files import Files
+# Columns written for every article, in output order.
+ARTICLE_COLUMNS = ["title", "date", "description", "picture_filename", "contains_money_format_on_title_or_description", "count_search_phrases"]
+
 
 class ExcelHandler:
     """Handles Excel operations."""
 
     def __init__(self):
-        self.excel_file = Files()
+        self._excel_file = None
+
+    @property
+    def excel_file(self):
+        """The RPA Excel library, imported on first use as it takes a noticeable part of the startup time."""
+        if self._excel_file is None:
+            from RPA.Excel.Files import Files
+            self._excel_file = Files()
+        return self._excel_file
 
     def create_excel(self, list_articles: list, output_path="./output/articles.xlsx"):
         """
         Create an Excel file with the provided list of articles.
-        
+
         Args:
         - list_articles (list): List of article dictionaries to be written to the Excel file.
         - output_path (str): Path where the Excel file will be saved.
-        
+
         Returns:
         - None
         """
@@ -22,20 +32,86 @@ class ExcelHandler:
 
         # Append an existing Table object
         table = self.transform_article_data(list_articles)
-        
+
         self.excel_file.append_rows_to_worksheet(table, header=True)
         self.excel_file.save_workbook(output_path)
 
+    def open_writer(self, output_path="./output/articles.xlsx", tracked_phrases=None):
+        """
+        Open a streaming Excel writer that appends articles as they are produced.
+
+        Args:
+        - output_path (str): Path where the Excel file will be saved.
+        - tracked_phrases (list): Additional tracked phrases, written as `count_<phrase>` columns.
+
+        Returns:
+        - ExcelStreamWriter: The writer; close it (or use it as a context manager) to save the file.
+        """
+        return ExcelStreamWriter(output_path, tracked_phrases)
+
     @staticmethod
     def transform_article_data(list_articles: list) -> dict:
         """
         Transforms a list of article data dictionaries into a dictionary of lists using dictionary comprehension.
-        
+
         Args:
         - list_articles (list): List of dictionaries, where each dictionary contains data for a single article.
-        
+
         Returns:
         - dict: A dictionary where each key corresponds to a field (e.g., title, date) and each value is a list of all values for that field across all articles.
         """
-        keys = ["title", "date", "description", "picture_filename", "contains_money_format_on_title_or_description", "count_search_phrases"]
-        return {key: [article[key] for article in list_articles] for key in keys}
+        table = {key: [article[key] for article in list_articles] for key in ARTICLE_COLUMNS}
+
+        # One extra column per additionally tracked phrase
+        tracked_phrases = list(list_articles[0].get("phrase_counts", {})) if list_articles else []
+        for phrase in tracked_phrases:
+            table[f"count_{phrase}"] = [article["phrase_counts"][phrase] for article in list_articles]
+
+        return table
+
+
+class ExcelStreamWriter:
+    """
+    Writes articles to an xlsx file row by row with constant memory.
+
+    Uses an openpyxl write-only workbook, which streams rows to a temporary file instead
+    of keeping the whole sheet in memory. The workbook is saved once, on `close`.
+    """
+
+    def __init__(self, output_path: str, tracked_phrases=None):
+        self.output_path = output_path
+        self.tracked_phrases = list(tracked_phrases or [])
+        self.rows_written = 0
+        from openpyxl import Workbook
+
+        self._workbook = Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet()
+        self._worksheet.append(ARTICLE_COLUMNS + [f"count_{phrase}" for phrase in self.tracked_phrases])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, article: dict):
+        """
+        Append one article as a row.
+
+        Args:
+        - article (dict): The article record.
+
+        Returns:
+        - None
+        """
+        phrase_counts = article.get("phrase_counts", {})
+        self._worksheet.append(
+            [article[key] for key in ARTICLE_COLUMNS] + [phrase_counts.get(phrase, 0) for phrase in self.tracked_phrases]
+        )
+        self.rows_written += 1
+
+    def close(self):
+        """Save the workbook to `output_path`."""
+        if self._workbook is not None:
+            self._workbook.save(self.output_path)
+            self._workbook = None
@@ -0,0 +1,213 @@
+"""
+Producer / consumer / reducer steps that spread large searches over several workers.
+
+- producer: splits each input search into shards, by date range or by category (`fan_out.shard_by`),
+  and creates one output work item per shard.
+- consumer: runs the search of one shard per input item and creates an output work item
+  with the shard's article records and an archive of its images.
+- reducer: collects the shards of each search, merges them into one deduplicated report
+  (newest first) with the pictures of the kept articles, and creates one output work item
+  per search with the report files. Run it on a single worker, so it sees every shard. The shards
+  of an incomplete search are kept on disk and merged by a later run, once the rest have arrived.
+
+Each step is a `SearchResultsPage.process_work_items` handler; see `tasks.py` and `robot.yaml`.
+"""
+import hashlib
+import json
+import os
+import shutil
+import zipfile
+
+from src.output_sinks import RecordSink, open_output_sink, read_records
+from src.parallel_search import merge_articles, split_date_range
+
+RECORDS_FILENAME = "articles.records.jsonl"
+IMAGES_FILENAME = "images.zip"
+SHARD_KEYS = ("search_id", "shard", "shard_count", "articles")
+
+
+def search_id(payload: dict) -> str:
+    """Identify the search a payload belongs to, ignoring the shard fields."""
+    search = {key: value for key, value in payload.items() if key not in SHARD_KEYS}
+    return hashlib.sha1(json.dumps(search, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def split_search(page) -> list:
+    """
+    Split the loaded search into the payload changes of each shard.
+
+    Args:
+    - page (SearchResultsPage): The page holding the loaded work item and the `fan_out` config.
+
+    Returns:
+    - list: One dictionary of payload values per shard.
+    """
+    shard_by = page.config.get("fan_out", {}).get("shard_by", "month")
+    if shard_by != "category":
+        return [{"search_dates_range": shard.to_search_dates_range()} for shard in split_date_range(page.date_range, shard_by)]
+
+    # Every category shard searches the same dates, even if the consumers run on different days
+    if not page.news_categories or "Any" in page.news_categories:
+        return [{"search_dates_range": page.search_dates_range}]
+    return [{"search_dates_range": page.search_dates_range, "news_categories": [category]} for category in page.news_categories]
+
+
+def produce_shards(page):
+    """
+    Producer step: create one output work item per shard of the current input search.
+
+    Args:
+    - page (SearchResultsPage): The page holding the loaded work item.
+
+    Returns:
+    - int: The number of shards.
+    """
+    payload = dict(page.input_wi)
+    shards = split_search(page)
+    current_search_id = search_id(payload)
+    for index, shard in enumerate(shards):
+        page.wi.create_output_work_item(
+            dict(payload, **shard, search_id=current_search_id, shard=index, shard_count=len(shards)), save=True
+        )
+
+    print(f"Split search {current_search_id} into {len(shards)} shards")
+    return len(shards)
+
+
+def consume_shard(page):
+    """
+    Consumer step: search the current shard and hand its articles and images to the reducer.
+
+    Args:
+    - page (SearchResultsPage): The page holding the loaded shard work item, with a browser open.
+
+    Returns:
+    - int: The number of articles extracted.
+    """
+    page.save_category_output = False
+    os.makedirs(page.directory_output_path, exist_ok=True)
+    records_path = os.path.join(page.directory_output_path, RECORDS_FILENAME)
+    images_path = os.path.join(page.directory_output_path, IMAGES_FILENAME)
+
+    page.apply_filters()
+    records = RecordSink(records_path)
+    page.extract_articles(writer=records)
+    # A partial shard would be merged as if complete; fail the item so it is retried instead
+    if page.extraction_interrupted:
+        raise RuntimeError(f"The shard {page.input_wi.get('shard')} of search {page.input_wi.get('search_id')} could not be searched to the end")
+
+    # Pictures are already compressed, so the archive only stores them
+    with zipfile.ZipFile(images_path, "w", zipfile.ZIP_STORED) as archive:
+        for article in read_records(records_path):
+            if article["picture_filename"]:
+                archive.write(os.path.join(page.directory_output_path, article["picture_filename"]), article["picture_filename"])
+
+    page.wi.create_output_work_item(
+        dict(page.input_wi, articles=records.rows_written), files=[records_path, images_path], save=True
+    )
+    return records.rows_written
+
+
+class ShardReducer:
+    """
+    Reducer step: gathers the shards of each search and merges them once they have all arrived.
+
+    Use `reduce_current_item` as the `process_work_items` handler and `is_shard` as its `accept`
+    check, and call `finish` afterwards, which fails the run if some searches are still missing shards.
+    The shards are kept in `<output root>/<search id>/.shards/` until their search is merged, so
+    a later run completes the search with the shards of the retried consumer items.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.searches = {}
+
+    @staticmethod
+    def is_shard(payload: dict) -> bool:
+        """Whether an input item is a consumer's shard, rather than any other output of the consumer robot."""
+        return "search_id" in payload and "shard" in payload
+
+    def reduce_current_item(self):
+        """Download the files of the current shard and merge its search if it was the last shard."""
+        payload = dict(self.page.input_wi)
+        self.searches[payload["search_id"]] = payload
+
+        # Downloaded next to the final directory and moved in at the end, so an interrupted download never counts as arrived
+        shard_directory = os.path.join(self.shards_directory(payload["search_id"]), str(payload["shard"]))
+        download_directory = f"{shard_directory}.partial"
+        shutil.rmtree(download_directory, ignore_errors=True)
+        os.makedirs(download_directory)
+        for filename in (RECORDS_FILENAME, IMAGES_FILENAME):
+            self.page.wi.get_work_item_file(filename, os.path.join(download_directory, filename))
+        shutil.rmtree(shard_directory, ignore_errors=True)
+        os.replace(download_directory, shard_directory)
+
+        if len(self.shard_directories(payload["search_id"])) == payload["shard_count"]:
+            report_files, article_count = self.merge(payload["search_id"])
+            self.page.wi.create_output_work_item(
+                {"search_id": payload["search_id"], "articles": article_count, "shards": payload["shard_count"]},
+                files=report_files,
+                save=True,
+            )
+
+    def finish(self):
+        """
+        Report the searches whose shards did not all arrive; their shards are kept for a later run.
+
+        Raises:
+        - RuntimeError: If some searches are still missing shards, so the run does not pass for complete.
+        """
+        for current_search_id, payload in self.searches.items():
+            print(
+                f"Search {current_search_id} is missing shards: got {len(self.shard_directories(current_search_id))} "
+                f"of {payload['shard_count']}, keeping them in {self.shards_directory(current_search_id)} until the rest arrive"
+            )
+        if self.searches:
+            raise RuntimeError(f"{len(self.searches)} searches are missing shards and were not merged: {', '.join(self.searches)}")
+
+    def search_directory(self, current_search_id: str) -> str:
+        return os.path.join(self.page.output_root_path, current_search_id)
+
+    def shards_directory(self, current_search_id: str) -> str:
+        return os.path.join(self.search_directory(current_search_id), ".shards")
+
+    def shard_directories(self, current_search_id: str) -> dict:
+        """The directories of the shards of a search that have arrived, in this run or an earlier one, by shard number."""
+        shards_directory = self.shards_directory(current_search_id)
+        if not os.path.isdir(shards_directory):
+            return {}
+        return {int(name): os.path.join(shards_directory, name) for name in os.listdir(shards_directory) if name.isdigit()}
+
+    def merge(self, current_search_id: str) -> tuple:
+        """
+        Merge the shards of a search into one deduplicated report, newest first, with the kept articles' pictures.
+
+        Args:
+        - current_search_id (str): The search.
+
+        Returns:
+        - tuple: The report file paths and the number of articles.
+        """
+        payload = self.searches.pop(current_search_id)
+        directory = self.search_directory(current_search_id)
+        shard_directories = [shard_directory for _, shard_directory in sorted(self.shard_directories(current_search_id).items())]
+
+        articles = merge_articles([list(read_records(os.path.join(shard_directory, RECORDS_FILENAME))) for shard_directory in shard_directories])
+
+        # The same article found by two category shards has two picture copies; only extract the kept one
+        pictures = {article["picture_filename"] for article in articles if article["picture_filename"]}
+        for shard_directory in shard_directories:
+            with zipfile.ZipFile(os.path.join(shard_directory, IMAGES_FILENAME)) as archive:
+                for name in archive.namelist():
+                    if name in pictures:
+                        archive.extract(name, directory)
+
+        output_formats = payload.get("output_formats", self.page.config.get("output_formats", "xlsx"))
+        output_formats = [output_formats] if isinstance(output_formats, str) else output_formats
+        with open_output_sink(output_formats, directory, tracked_phrases=payload.get("tracked_phrases", [])) as writer:
+            for article in articles:
+                writer.write(article)
+
+        shutil.rmtree(self.shards_directory(current_search_id), ignore_errors=True)
+        print(f"Merged {len(shard_directories)} shards of search {current_search_id} into {len(articles)} articles in {directory}")
+        return [os.path.join(directory, f"articles.{output_format}") for output_format in output_formats], len(articles)
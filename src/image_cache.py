@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ImageCache:
+    """
+    Persistent on-disk image cache keyed by URL and deduplicated by content hash.
+
+    Image bodies are stored once under their SHA-256 digest and every URL that served the
+    same bytes points at that blob. When the total size exceeds `max_size_bytes`, the least
+    recently used blobs are evicted. The index is kept in memory and written back on `save`.
+
+    The blobs are kept in least-recently-used order with a running total size, so a lookup,
+    a store and each eviction cost the same however large the cache is. The lock only covers
+    the index; blob files are read and written outside it, so concurrent downloads do not queue.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, directory: str, max_size_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        urls, blobs = self._load_index()
+        self._urls = urls
+        # Least recently used first
+        self._blobs = OrderedDict(sorted(blobs.items(), key=lambda item: item[1]["last_access"]))
+        self._urls_by_digest = {}
+        for url, digest in urls.items():
+            self._urls_by_digest.setdefault(digest, set()).add(url)
+        self._total_size = sum(blob["size"] for blob in self._blobs.values())
+
+    def get(self, url: str):
+        """
+        Return the cached body of a URL, or None if it is not cached.
+
+        Parameters:
+        - url: The image URL.
+
+        Returns:
+        - bytes | None: The cached content.
+        """
+
+        with self._lock:
+            digest = self._urls.get(url)
+            if digest is None or digest not in self._blobs:
+                self.misses += 1
+                return None
+
+        try:
+            with open(self._blob_path(digest), "rb") as file:
+                content = file.read()
+        except OSError:
+            # The blob was evicted meanwhile, or removed from disk behind our back; forget it.
+            with self._lock:
+                self._forget_blob(digest)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is not None:
+                blob["last_access"] = time.time()
+                self._blobs.move_to_end(digest)
+            self.hits += 1
+        return content
+
+    def put(self, url: str, content: bytes):
+        """
+        Store the body of a URL in the cache, evicting old entries if needed.
+
+        Parameters:
+        - url: The image URL.
+        - content: The image bytes.
+
+        Returns:
+        - None
+        """
+
+        if len(content) > self.max_size_bytes:
+            return
+
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            stored = digest in self._blobs
+
+        if not stored:
+            # Unique per thread, so two threads storing the same bytes do not write one file
+            temporary_path = f"{self._blob_path(digest)}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(content)
+            os.replace(temporary_path, self._blob_path(digest))
+
+        with self._lock:
+            if digest in self._blobs:
+                self._blobs[digest]["last_access"] = time.time()
+                self._blobs.move_to_end(digest)
+            else:
+                self._blobs[digest] = {"size": len(content), "last_access": time.time()}
+                self._total_size += len(content)
+
+            previous_digest = self._urls.get(url)
+            if previous_digest is not None and previous_digest != digest:
+                self._urls_by_digest.get(previous_digest, set()).discard(url)
+            self._urls[url] = digest
+            self._urls_by_digest.setdefault(digest, set()).add(url)
+            evicted = self._evict()
+
+        # A blob evicted here and stored again by another thread at the same time may lose its file;
+        # the next `get` then finds it missing and forgets it.
+        for evicted_digest in evicted:
+            try:
+                os.remove(self._blob_path(evicted_digest))
+            except OSError:
+                pass
+
+    def save(self):
+        """Write the cache index to disk."""
+        with self._lock:
+            index = {"urls": dict(self._urls), "blobs": {digest: dict(blob) for digest, blob in self._blobs.items()}}
+        temporary_path = f"{self._index_path()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(index, file)
+        os.replace(temporary_path, self._index_path())
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached blobs."""
+        return self._total_size
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+        - dict: Hits, misses, number of blobs and total size in bytes.
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._blobs), "size_bytes": self.size_bytes}
+
+    def _evict(self) -> list:
+        """Drop the least recently used blobs from the index until the cache fits; returns their digests for removal from disk."""
+        evicted = []
+        while self._total_size > self.max_size_bytes and self._blobs:
+            digest = next(iter(self._blobs))
+            self._forget_blob(digest)
+            evicted.append(digest)
+        return evicted
+
+    def _forget_blob(self, digest: str):
+        blob = self._blobs.pop(digest, None)
+        if blob is not None:
+            self._total_size -= blob["size"]
+        for url in self._urls_by_digest.pop(digest, ()):
+            if self._urls.get(url) == digest:
+                del self._urls[url]
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), "r") as file:
+                index = json.load(file)
+            return index["urls"], index["blobs"]
+        except (OSError, ValueError, KeyError):
+            return {}, {}
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, self.INDEX_FILENAME)
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest)
@@ -0,0 +1,176 @@
+import http.client
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urljoin
+
+from src.utility import metrics
+
+
+class ImageDownloader:
+    """
+    Downloads images concurrently over reused keep-alive connections.
+
+    Each worker thread keeps one persistent HTTP(S) connection per host, so consecutive
+    images from the same CDN skip the TCP/TLS handshake. Downloads are submitted while the
+    articles are being extracted and their filenames collected before the Excel step.
+    """
+
+    MAX_REDIRECTS = 3
+
+    def __init__(self, save_path: str, max_workers: int = 8, timeout: float = 10, cache=None, scheduler=None):
+        self.save_path = save_path
+        self.cache = cache
+        # Rate limits, retries and circuit breakers per host; None sends every request once, as it comes
+        self.scheduler = scheduler
+        self.failures = 0
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-downloader")
+        self._local = threading.local()
+        # Every thread's open connections, closed together by `close`
+        self._open_connections = set()
+        self._lock = threading.Lock()
+        os.makedirs(save_path, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, url: str):
+        """
+        Schedule the download of an image and return immediately.
+
+        Parameters:
+        - url: The URL of the image to be downloaded.
+
+        Returns:
+        - Future: Resolves to the saved filename, or '' if there is no URL or the download failed.
+        """
+
+        return self._executor.submit(self.download, url)
+
+    def download(self, url: str) -> str:
+        """
+        Download an image and save it with a unique filename.
+
+        Parameters:
+        - url: The URL of the image to be downloaded.
+
+        Returns:
+        - str: The saved filename, or '' if there is no URL or the download failed.
+        """
+
+        if not url:
+            return ''
+
+        content = self.cache.get(url) if self.cache else None
+        if content is None:
+            try:
+                content = self.fetch(url)
+            except Exception as e:
+                metrics.increment("image_download_failures")
+                with self._lock:
+                    self.failures += 1
+                print(f"Error when downloading image {url}. Original error: {str(e)}")
+                return ''
+            metrics.increment("images_downloaded")
+            metrics.increment("image_bytes_downloaded", len(content))
+            if self.cache:
+                self.cache.put(url, content)
+        else:
+            metrics.increment("images_from_cache")
+
+        filename = str(uuid.uuid4()) + ".jpg"
+        with open(os.path.join(self.save_path, filename), "wb") as file:
+            file.write(content)
+
+        return filename
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Fetch the body of a URL using the calling thread's pooled connection for its host.
+
+        Parameters:
+        - url: The URL to fetch.
+
+        Returns:
+        - bytes: The response body.
+        """
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            if self.scheduler:
+                status, headers, body = self.scheduler.request(url, lambda: self._request(url))
+            else:
+                status, headers, body = self._request(url)
+            if status in (301, 302, 303, 307, 308) and headers.get("Location"):
+                url = urljoin(url, headers["Location"])
+                continue
+            if status != 200:
+                raise IOError(f"HTTP {status} for {url}")
+            return body
+
+        raise IOError(f"Too many redirects for {url}")
+
+    def close(self):
+        """Wait for pending downloads, shut down the worker threads, report failures and persist the cache index."""
+        self._executor.shutdown(wait=True)
+        if self.scheduler:
+            stats = self.scheduler.stats()
+            print(
+                f"Image requests: {stats['succeeded']} succeeded ({stats['succeeded_per_second']}/s), "
+                f"{stats['retries']} retries, {stats['throttled']} throttled, {stats['breaker_rejections']} rejected by an open circuit breaker"
+            )
+        if self.failures:
+            print(f"{self.failures} images could not be downloaded; their articles have no picture")
+        with self._lock:
+            for connection in self._open_connections:
+                connection.close()
+            self._open_connections.clear()
+        if self.cache:
+            self.cache.save()
+
+    def _request(self, url: str):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        # A keep-alive connection may have been closed by the server since its last use,
+        # so retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            connection = self._get_connection(parts.scheme, parts.netloc)
+            try:
+                connection.request("GET", path, headers={"Connection": "keep-alive"})
+                response = connection.getresponse()
+                body = response.read()
+                if response.will_close:
+                    self._drop_connection(parts.scheme, parts.netloc)
+                return response.status, response.headers, body
+            except (http.client.HTTPException, ConnectionError):
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt:
+                    raise
+
+    def _get_connection(self, scheme: str, netloc: str):
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+
+        key = (scheme, netloc)
+        if key not in connections:
+            connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connections[key] = connection_class(netloc, timeout=self.timeout)
+            with self._lock:
+                self._open_connections.add(connections[key])
+        return connections[key]
+
+    def _drop_connection(self, scheme: str, netloc: str):
+        connection = self._local.connections.pop((scheme, netloc), None)
+        if connection is not None:
+            with self._lock:
+                self._open_connections.discard(connection)
+            connection.close()
@@ -1,11 +1,24 @@
-from RPA.Robocorp.WorkItems import WorkItems
+import os
 import re
-import datetime
-from time import sleep
-import logging
-from src.utility import Utility, ErrorHandler, ErrorHandlingContext
+import time
+from src.utility import Utility, ErrorHandler, ErrorHandlingContext, metrics
 from src.excel_handler import ExcelHandler
+from src.image_downloader import ImageDownloader
+from src.request_scheduler import RequestScheduler
+from src.image_cache import ImageCache
+from src.date_engine import DateRange
+from src.text_analyzer import TextAnalyzer
+from src.output_sinks import open_output_sink
+from src.waits import Waiter
+from src.checkpoint import CheckpointJournal
+from src.article_index import ArticleIndex, article_hash, bring_picture, search_key
+from src.pipeline import parse_articles, filter_by_date, enrich_articles, fetch_images
 import json
+from urllib.parse import urlencode
+
+
+class ExtractionInterrupted(RuntimeError):
+    """The search results could not be read to the end, e.g. because the browser session died."""
 
 # Page Object Pattern Implementation
 # Redefining the NYTBasePage class for context
@@ -14,8 +27,18 @@ class NYTBasePage:
     def __init__(self, browser):
         self.browser = browser
 
+    def load_config(self, filename="config.json"):
+        '''load_config function.
+
+        Args:
+        - filename (): Description needed.
+        '''
+        with open(filename, 'r') as file:
+            config = json.load(file)
+        return config
+
     @ErrorHandler.handle_errors("Error when opening the website.")
-    def open_the_website(self, url):
+    def open_the_website(self, url, isolated=False):
         '''Open the specified website URL in the browser.
 
         Args:
@@ -23,12 +46,75 @@ class NYTBasePage:
 
             Args:
             - url (str): The website URL to open.
+            - isolated (bool): Start a new headless browser with a fresh profile, ignoring `attach_port` and `profile_path` (used by worker processes).
 
             Returns:
-            - None
+            - bool: True once the website is open; None if opening it failed (the error is handled and logged).
             '''
 
-        self.browser.open_available_browser(url)
+        browser_config = self.load_config().get("browser", {})
+        lean_profile = browser_config.get("lean", {})
+        if not lean_profile.get("enabled", False):
+            lean_profile = {}
+
+        disable_images = bool(lean_profile) and lean_profile.get("disable_images", True)
+
+        if isolated or not self.attach_to_browser(browser_config.get("attach_port")):
+            profile_path = None if isolated else browser_config.get("profile_path")
+            headless = True if isolated else lean_profile.get("headless", browser_config.get("headless", "AUTO"))
+            self.browser.open_available_browser(
+                headless=headless,
+                use_profile=bool(profile_path),
+                profile_path=profile_path,
+                profile_name=browser_config.get("profile_name"),
+                # Images are downloaded separately from their URLs, the page only needs the markup
+                preferences={"profile.managed_default_content_settings.images": 2} if disable_images else None,
+            )
+        metrics.instrument_webdriver(self.browser.driver)
+
+        # Block before the first navigation so the search page never requests them
+        self.block_urls(lean_profile.get("blocked_urls", []))
+        self.browser.go_to(url)
+        return True
+
+    def attach_to_browser(self, attach_port):
+        '''Attach to a Chrome already running with `--remote-debugging-port`, when `browser.attach_port` is configured.
+
+        Args:
+        - attach_port (int): The remote debugging port, or None to not attach.
+
+        Returns:
+        - bool: True if attached, False to start a new browser instead.
+        '''
+
+        if not attach_port:
+            return False
+
+        try:
+            self.browser.attach_chrome_browser(int(attach_port))
+        except Exception as e:
+            print(f"Could not attach to the browser on port {attach_port}, starting a new one. Original error: {str(e)}")
+            return False
+        return True
+
+    def block_urls(self, url_patterns):
+        '''Make the browser drop requests to URLs matching any of the patterns (`*` is a wildcard).
+
+        Uses the Chrome DevTools protocol; other browsers load everything.
+
+        Args:
+        - url_patterns (list): The URL patterns, e.g. "*doubleclick.net*" or "*.woff2".
+
+        Returns:
+        - None
+        '''
+
+        if not url_patterns:
+            return
+
+        with ErrorHandlingContext("Error when blocking URLs in the browser"):
+            self.browser.driver.execute_cdp_cmd("Network.enable", {})
+            self.browser.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": url_patterns})
 
 class HomePage(NYTBasePage):
     '''Represents the main page of the New York Times.'''
@@ -38,18 +124,23 @@ class HomePage(NYTBasePage):
         self.url = "https://www.nytimes.com/"
 
 class SearchResultsPage(NYTBasePage):
-    '''Represents the search results page on the New York Times.'''
-    def __init__(self, browser):
+    '''Represents the search results page on the New York Times.
+
+    The search parameters come from the input work items, or from `payload` when one is given
+    (e.g. by a worker process searching one date shard), in which case work items are not used.
+    '''
+    def __init__(self, browser, payload=None, output_directory=None):
         super().__init__(browser)
         self.utils = Utility(browser)
-        self.wi = WorkItems()
-        self.wi.get_input_work_item()
-        self.input_wi = self.wi.get_work_item_variables() 
-        self.search_phrase = self.input_wi["search_phrase"]
-        self.news_categories = self.input_wi["news_categories"]
-        self.number_of_months = self.input_wi["number_of_months"]
+        self.payload = payload
+        self.wi = None
+        if payload is None:
+            # Imported on first use: the work items library pulls in Robot Framework and IPython
+            from RPA.Robocorp.WorkItems import WorkItems
+
+            self.wi = WorkItems()
+            self.wi.get_input_work_item()
         self.excel_handler = ExcelHandler()
-        self.search_dates_range = self.utils.calculate_search_dates_range(self.number_of_months)
         self.config = self.load_config()
 
         # Extracting selectors and other configurations from the config dictionary
@@ -62,6 +153,7 @@ class SearchResultsPage(NYTBasePage):
         self.start_date_input_button = self.config["selectors"]["start_date_input_button"]
         self.end_date_input_button = self.config["selectors"]["end_date_input_button"]
         self.show_more_button = self.config["selectors"]["show_more_button"]
+        self.sort_by_select = self.config["selectors"]["sort_by_select"]
         self.xpath_categories = self.config["selectors"]["xpath_categories"]
         self.cookies_acceptance_selector = self.config["selectors"]["cookies_acceptance_selector"]
         self.terms_update_acceptance_selector = self.config["selectors"]["terms_update_acceptance_selector"]
@@ -72,96 +164,220 @@ class SearchResultsPage(NYTBasePage):
         self.image_locator = self.config["selectors"]["image_locator"]
 
         # Getting other configurations
-        self.directory_output_path = self.config["output_directory"]
-
-    def load_config(self, filename="config.json"):
-        '''load_config function.
+        self.base_url = self.config["base_url"]
+        self.output_root_path = output_directory or self.config["output_directory"]
+        self.navigation_mode = self.config.get("navigation_mode", "url")
+        self.section_uris = self.config.get("section_uris", {})
+        self.extraction_mode = self.config.get("extraction_mode", "bulk")
+        self.run_mode = self.config.get("run_mode", "sync")
+        self.image_downloads_config = self.config.get("image_downloads", {})
+        self.image_cache = self.create_image_cache(self.config.get("image_cache", {}))
+        self.parallel_config = self.config.get("parallel", {})
+        self.metrics_config = self.config.get("metrics", {})
+        # Individual spans are only needed for the Chrome trace
+        metrics.keep_spans = self.metrics_config.get("chrome_trace", False)
+        self.checkpoint_config = self.config.get("checkpoint", {})
+        self.checkpoint = None
+        self.article_index_config = self.config.get("article_index", {})
+        self.article_index = self.create_article_index(self.article_index_config)
+        self.reached_indexed_articles = False
+        self.extraction_interrupted = False
+        self.written_articles = set()
+        self.waiter = Waiter(browser, self.config.get("timeouts", {}), self.config.get("adaptive_timeouts", {}))
+        self.modals_closed = False
+        self.category_states = None
+        # Set when every requested category on the page has 0 results, so nothing is extracted
+        self.categories_empty = False
+        # The fan-out consumers turn this off, so the reducer only receives shard items
+        self.save_category_output = True
+
+        with ErrorHandlingContext("Error when loading the first input work item"):
+            self.load_work_item()
+
+    def load_work_item(self, output_subfolder=None):
+        '''Read the search parameters of the current input work item.
 
         Args:
-        - filename (): Description needed.
+        - output_subfolder (str): Optional folder, inside the configured output directory, for this item's files.
+
+        Returns:
+        - None
         '''
-        with open(filename, 'r') as file:
-            config = json.load(file)
-        return config
 
-    def filter_articles_by_search_dates_range(self, articles):
-        '''Filters articles based on a given date range.
+        self.input_wi = self.wi.get_work_item_variables() if self.wi else self.payload
+        self.search_phrase = self.input_wi["search_phrase"]
+        self.news_categories = self.input_wi["news_categories"]
+        self.number_of_months = self.input_wi["number_of_months"]
+        self.tracked_phrases = self.input_wi.get("tracked_phrases", [])
+        self.text_analyzer = TextAnalyzer([self.search_phrase] + self.tracked_phrases)
+        # An explicit range (MM/DD/YYYY bounds) restricts the search to one shard of the number_of_months window
+        self.search_dates_range = self.input_wi.get("search_dates_range") or self.utils.calculate_search_dates_range(self.number_of_months)
+        self.date_range = DateRange.from_search_dates_range(self.search_dates_range)
+        # The work item can override the output formats configured for the robot
+        self.output_formats = self.input_wi.get("output_formats", self.config.get("output_formats", "xlsx"))
+        self.directory_output_path = os.path.join(self.output_root_path, output_subfolder) if output_subfolder else self.output_root_path
+        # In delta mode pagination stops at the first indexed article and the indexed ones are merged into the output
+        self.delta = bool(self.article_index) and self.input_wi.get("delta", self.article_index_config.get("delta", False))
+        self.search_key = search_key(self.search_phrase, self.news_categories)
+
+    def process_work_items(self, handler=None, accept=None):
+        '''Run the search of every input work item in the current browser session.
+
+        Each item writes its files to its own subfolder of the output directory and is
+        released as done, or as failed with the error message if the search raised.
 
         Args:
-        - articles (): Description needed.
+        - handler (callable): What to do with each item once it is loaded, `search_current_item` by default
+          (the fan-out steps in `src/fan_out.py` pass their own).
+        - accept (callable): Optional check of each item's payload; items it rejects are released as done unprocessed.
 
-            Args:
-            - articles (list): List of article dictionaries.
-            - search_dates_range (dict): Dictionary with 'start_date' and 'end_date' keys.
+        Returns:
+        - list: The ids of the items that failed.
+        '''
 
-            Returns:
-            - list: Filtered list of articles.
-            '''
+        from RPA.Robocorp.WorkItems import State, Error
+
+        handler = handler or self.search_current_item
+        failed_items = []
+
+        def process_current_item():
+            item_id = self.wi.current.id
+            if accept and not accept(self.wi.get_work_item_variables()):
+                print(f"Skipping work item {item_id}")
+                self.wi.release_input_work_item(State.DONE)
+                return
+            try:
+                self.load_work_item(output_subfolder=re.sub(r'[^\w.-]', '_', str(item_id)))
+                print(f"Processing work item {item_id}: {self.search_phrase!r}")
+                handler()
+            except Exception as e:
+                print(f"Error when processing work item {item_id}. Original error: {str(e)}")
+                failed_items.append(item_id)
+                # Missing or invalid payload values won't succeed on a retry, anything else might
+                exception_type = Error.BUSINESS if isinstance(e, (KeyError, ValueError)) else Error.APPLICATION
+                self.wi.release_input_work_item(State.FAILED, exception_type=exception_type, message=str(e))
+                metrics.increment("work_items_failed")
+            else:
+                self.wi.release_input_work_item(State.DONE)
+                metrics.increment("work_items_done")
+
+        self.wi.for_each_input_work_item(process_current_item, return_results=False)
+
+        with ErrorHandlingContext("Error when saving the run metrics"):
+            self.save_metrics()
+
+        with ErrorHandlingContext("Error when saving the observed wait latencies"):
+            self.waiter.save()
+
+        return failed_items
+
+    def search_current_item(self):
+        '''Run the search of the loaded work item and write its output files.
+
+        Returns:
+        - None
+        '''
 
-        # Convert the start_date and end_date strings to datetime objects
-        start_date = datetime.datetime.strptime(self.search_dates_range['start_date'], '%m/%d/%Y')
-        end_date = datetime.datetime.strptime(self.search_dates_range['end_date'], '%m/%d/%Y')
+        from src.parallel_search import run_sharded_search
 
-        # Filter the articles based on the date range
-        filtered_articles = [
-            article for article in articles
-            if start_date <= datetime.datetime.strptime(self.utils.text_to_formatted_date(article['date']), '%m/%d/%Y') <= end_date
-        ]
+        if self.parallel_config.get("enabled", False):
+            run_sharded_search(self)
+        else:
+            self.apply_filters()
+            self.extract_articles()
 
-        return filtered_articles
+    def save_metrics(self):
+        '''Write the run metrics (and the Chrome trace, if enabled) to the output directory.
 
-    def count_search_phrases(self, title: str, description: str, term: str) -> int:
-        '''Counts the occurrences of the search phrase (term) in the title and description.
+        Returns:
+        - None
+        '''
+
+        if not self.metrics_config.get("enabled", True):
+            return
+        metrics_path = metrics.save(self.output_root_path, chrome_trace=self.metrics_config.get("chrome_trace", False))
+        print(f"Saved run metrics to {metrics_path}")
+
+    def create_image_cache(self, cache_config):
+        '''Create the persistent image cache described by the `image_cache` config section.
 
         Args:
-        - title (): Description needed.
-        - description (): Description needed.
-        - term (): Description needed.
+        - cache_config (dict): The `image_cache` section of the config.
 
-            Args:
-            - title (str): The article title.
-            - description (str): The article description.
-            - term (str): The search phrase.
+        Returns:
+        - ImageCache | None: The cache, or None when it is disabled.
+        '''
 
-            Returns:
-            - int: The total count of the search phrase in the title and description.
-            '''
+        if not cache_config.get("enabled", False):
+            return None
+        return ImageCache(
+            cache_config.get("directory", "./.image_cache"),
+            max_size_bytes=int(cache_config.get("max_size_mb", 500) * 1024 * 1024),
+        )
+
+    def create_article_index(self, index_config):
+        '''Open the cross-run article index described by the `article_index` config section.
+
+        Args:
+        - index_config (dict): The `article_index` section of the config.
+
+        Returns:
+        - ArticleIndex | None: The index, or None when it is disabled.
+        '''
+
+        if not index_config.get("enabled", False):
+            return None
+        return ArticleIndex(index_config.get("path", "./.article_index.sqlite"))
+
+    def get_category_states(self):
+        '''Return the name, result count and checked flag of every category of the current search.
 
-        # Counting occurrences of term in both title and description
-        count_in_title = title.lower().count(term.lower())
-        count_in_description = description.lower().count(term.lower())
+        Read with a single script and cached until the next search is loaded or a checkbox is toggled.
 
-        return count_in_title + count_in_description
+        Returns:
+        - list: One dictionary per category with `name`, `count` and `checked` keys.
+        '''
+
+        if self.category_states is None:
+            self.category_states = self.utils.get_category_states(self.xpath_categories)
+        return self.category_states
 
     def get_available_categories(self):
         '''Extracts all available categories from the dropdown list.
-        Args:
 
-            categories = [element.text for element in self.browser.get_webelements(self.xpath_categories)]
+        Returns:
+        - list: The category names, without their result counts.
+        '''
 
-            # Remove numbers from each category name
-            cleaned_categories = [re.sub(r'\d+', '', category) for category in categories]
+        return [state["name"] for state in self.get_category_states()]
 
-            return cleaned_categories
-        '''
-        categories = [element.text for element in self.browser.get_webelements(self.xpath_categories)]
+    def get_category_counts(self):
+        '''Return the number of results NYT shows for each category of the current search.
 
-        # Remove numbers from each category name
-        cleaned_categories = [re.sub(r'\d+', '', category) for category in categories]
+        Returns:
+        - dict: Category name to result count (None when the page shows no count).
+        '''
 
-        return cleaned_categories
+        return {state["name"]: state["count"] for state in self.get_category_states()}
 
     def get_valid_categories(self):
         '''Checks if the provided categories are part of the available categories.
+
+        Categories with no results for the current search are left out too.
         Args:
             '''
 
         # Return only those categories from news_categories that exist in the available_categories
-        available_categories = self.get_available_categories()
-        valid_categories = [category for category in self.news_categories if category in available_categories]
+        category_counts = self.get_category_counts()
+        valid_categories = [category for category in self.news_categories if category in category_counts and category_counts[category] != 0]
+
+        empty_categories = [category for category in self.news_categories if category_counts.get(category) == 0]
+        if empty_categories:
+            print(f"Skipping categories without results: {', '.join(empty_categories)}")
 
         # Save output workitem - versioning valid categories
-        self.wi.create_output_work_item({"valid_categories":valid_categories}, save=True)
+        if self.wi and self.save_category_output:
+            self.wi.create_output_work_item({"valid_categories": valid_categories, "category_counts": category_counts}, save=True)
 
         return valid_categories
 
@@ -171,24 +387,45 @@ class SearchResultsPage(NYTBasePage):
         Args:
         '''
 
-        # Step 0: Filter out categories that are not present on the webpage
-        valid_categories = self.get_valid_categories()    
-        # If the resulting list is empty, only select 'Any'
-        if not valid_categories:
-            self.check_category("Any")
+        # Step 0: Filter out categories that are not present on the webpage, or that have no results
+        valid_categories = self.get_valid_categories()
+        category_counts = self.get_category_counts()
+        if not valid_categories and "Any" not in self.news_categories and any(category in category_counts for category in self.news_categories):
+            # The requested categories exist but are all empty; selecting 'Any' would report other sections' articles
+            print("None of the requested categories has results, the report will be empty")
+            self.categories_empty = True
             return
+        # If none of the categories is on the page, or the list contains 'Any', only select 'Any'
+        if not valid_categories or "Any" in valid_categories:
+            self.select_categories(["Any"])
+        else:
+            self.select_categories(valid_categories)
 
-        #elif contains 'Any', only select 'Any'
-        elif "Any" in valid_categories:
-            self.check_category("Any")
-            return
+    def select_categories(self, news_categories, exclusive=True):
+        '''Make exactly the given categories checked, clicking only the checkboxes whose state must change, in one call.
 
-        else:
+        Args:
+        - news_categories (list): The categories to check.
+        - exclusive (bool): Uncheck the other categories ("Any" is left to the page).
 
-            # Check and select each valid category in the list
-            for category in valid_categories:
-                self.check_category(category)
-            return
+        Returns:
+        - None
+        '''
+
+        toggle = []
+        for index, state in enumerate(self.get_category_states()):
+            if state["name"] in news_categories:
+                wanted = True
+            elif exclusive and state["name"] != "Any":
+                wanted = False
+            else:
+                wanted = state["checked"]
+            if state["checked"] != wanted:
+                toggle.append(index)
+
+        if toggle:
+            self.category_states = self.utils.get_category_states(self.xpath_categories, toggle=toggle)
+            metrics.increment("category_toggles", len(toggle))
 
     def check_category(self, news_category):
         '''check_category function.
@@ -197,124 +434,534 @@ class SearchResultsPage(NYTBasePage):
         - news_category (): Description needed.
         '''
 
-        # XPath to locate the checkbox based on the inner text of its corresponding label
-        checkbox_xpath = f'//label[contains(., "{news_category}")]/input[@type="checkbox"]'
-
-        # Check if the checkbox is already checked
-        is_checked = self.browser.is_element_attribute_equal_to(checkbox_xpath, "checked", "true")
-
-        # If the checkbox is not already checked, click on it
-        if not is_checked:
-            self.browser.click_element_when_clickable(checkbox_xpath)
+        self.select_categories([news_category], exclusive=False)
 
     def close_modals(self):
         '''Close modals that might appear during page interactions.
+
+        Once accepted they do not show up again in the same browser session, so later calls return immediately.
         Args:
         '''
 
-        try:
-            # Wait for and click the terms update acceptance button (if it appears)
-            self.browser.click_element_when_clickable(self.terms_update_acceptance_selector, timeout=15)
-        except Exception as e:
-            # If the modal doesn't appear within the timeout, just log a message and continue
-            print(f"Terms update acceptance modal did not appear or could not be closed: {e}")
+        if self.modals_closed:
+            return
+        self.modals_closed = True
+
+        # Race both modals and the results list; click each modal as soon as it shows up
+        pending_modals = {
+            "terms_update_acceptance_selector": self.terms_update_acceptance_selector,
+            "cookies_acceptance_selector": self.cookies_acceptance_selector,
+        }
+        deadline = time.perf_counter() + max(self.waiter.timeout(name) for name in pending_modals)
+        results_ready = False
+
+        while pending_modals:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
 
-        try:
-            # Wait for and click the cookies acceptance button (if it appears)
-            self.browser.click_element_when_clickable(self.cookies_acceptance_selector, timeout=10)
-        except Exception as e:
-            # If the modal doesn't appear within the timeout, just log a message and continue
-            print(f"Cookies acceptance modal did not appear or could not be closed: {e}")
+            conditions = dict(pending_modals)
+            if not results_ready:
+                conditions["results_list"] = self.root_div_elements_css
+
+            resolved = self.waiter.wait_for_any(conditions, remaining)
+            if resolved is None:
+                break
+
+            if resolved == "results_list":
+                # Modals render together with the page, so once results are in only wait a short grace period for them
+                results_ready = True
+                deadline = min(deadline, time.perf_counter() + self.waiter.timeout("modal_grace"))
+                continue
+
+            with ErrorHandlingContext(f"Error when closing the {resolved} modal"):
+                self.browser.click_element(pending_modals.pop(resolved))
+
+        if pending_modals:
+            print(f"Modals not shown: {', '.join(pending_modals)}")
+
+    def build_search_url(self):
+        '''Build the search results URL for the work-item payload and the search dates range.
+
+        Categories are only added to the `sections` parameter when their section URI is
+        configured in `section_uris`; the remaining ones are checked on the page.
+
+        Returns:
+        - str: The search results URL.
+        '''
+
+        params = {
+            "query": self.search_phrase,
+            "sort": "newest",
+            "startDate": self.date_range.start.strftime('%Y-%m-%d'),
+            "endDate": self.date_range.end.strftime('%Y-%m-%d'),
+        }
+
+        sections = [self.section_uris[category] for category in self.news_categories if category in self.section_uris]
+        if sections and "Any" not in self.news_categories:
+            params["sections"] = ",".join(sections)
+
+        return f"{self.base_url.rstrip('/')}/search?{urlencode(params)}"
 
     def apply_filters(self):
         '''Apply filters on the search results page to narrow down the articles based on criteria.
 
+        With `navigation_mode` set to "url" the query, dates and sort order are applied by
+        opening the search URL directly; otherwise they are applied through the page UI.
+
         Returns:
         - None
         Args:
         '''
 
+        # Categories and their counts depend on the search, so read them again for this one
+        self.category_states = None
+        self.categories_empty = False
+
+        if self.navigation_mode == "url":
+            self.apply_filters_by_url()
+        else:
+            self.apply_filters_by_ui()
+
+    def apply_filters_by_url(self):
+        '''Open the search URL built from the payload and check the categories it could not encode.
+
+        Returns:
+        - None
+        '''
+
+        with ErrorHandlingContext("Error when opening the search URL"):
+            self.browser.go_to(self.build_search_url())
+
+        self.close_modals()
+
+        with ErrorHandlingContext("Error when clicking on multiselect button"):
+            self.browser.click_element_when_clickable(self.multiselect_button, timeout=self.waiter.timeout("multiselect_button"))
+
+        with ErrorHandlingContext("Error when checking categories"):
+            # Validates the categories against the page; those already selected by the URL are left as they are
+            self.check_categories()
+
+        with ErrorHandlingContext("Error when collapsing multiselect button"):
+            self.browser.click_element_when_clickable(self.multiselect_button, timeout=self.waiter.timeout("multiselect_button"))
+
+    def apply_filters_by_ui(self):
+        '''Apply the filters by interacting with the search form, one element at a time.
+
+        Returns:
+        - None
+        '''
+
         self.close_modals()
 
         with ErrorHandlingContext("Error when clicking on magnifier button"):
-            self.browser.click_element_when_clickable(self.magnifier_button, timeout=10)
+            self.browser.click_element_when_clickable(self.magnifier_button, timeout=self.waiter.timeout("magnifier_button"))
 
         with ErrorHandlingContext("Error when inputting the search term"):
             self.browser.input_text_when_element_is_visible(self.search_input_selector, self.search_phrase)
 
         with ErrorHandlingContext("Error when clicking on magnifier button"):
-            self.browser.click_element_when_clickable(self.go_button, timeout=10)
+            self.browser.click_element_when_clickable(self.go_button, timeout=self.waiter.timeout("go_button"))
 
         with ErrorHandlingContext("Error when selecting date range"):
-            self.browser.click_element_when_clickable(self.multiselect_date_range_button, timeout=10)
-            self.browser.click_element_when_clickable(self.specific_dates_button, timeout=10)
+            self.browser.click_element_when_clickable(self.multiselect_date_range_button, timeout=self.waiter.timeout("multiselect_date_range_button"))
+            self.browser.click_element_when_clickable(self.specific_dates_button, timeout=self.waiter.timeout("specific_dates_button"))
             self.browser.input_text_when_element_is_visible(self.start_date_input_button, self.search_dates_range["start_date"])
             self.browser.input_text_when_element_is_visible(self.end_date_input_button, self.search_dates_range["end_date"])
             self.browser.press_keys(self.end_date_input_button , "ENTER")
 
         with ErrorHandlingContext("Error when clicking on magnifier button"):
-            self.browser.click_element_when_clickable(self.multiselect_button, timeout=10)
+            self.browser.click_element_when_clickable(self.multiselect_button, timeout=self.waiter.timeout("multiselect_button"))
 
         with ErrorHandlingContext("Error when checking categories"):
             self.check_categories()
 
         with ErrorHandlingContext("Error when collapsing magnifier button"):
-            self.browser.click_element_when_clickable(self.multiselect_button, timeout=10)
+            self.browser.click_element_when_clickable(self.multiselect_button, timeout=self.waiter.timeout("multiselect_button"))
 
-    def extract_articles(self):
-        '''Extract article details like title, date, and description from the search results page.
+        with ErrorHandlingContext("Error when sorting results by newest"):
+            # Pagination stops at the first batch older than the start date, which requires newest-first results
+            self.browser.select_from_list_by_value(self.sort_by_select, "newest")
+
+    def collect_raw_articles(self, article_divs):
+        '''Collect the raw fields (date, title, description, image_url, image_srcset) of every article div.
+
+        Uses a single injected script when `extraction_mode` is "bulk" and falls back to
+        the per-element WebDriver lookups if the script fails or the mode is "per_element".
+
+        Args:
+        - article_divs (list): The located article root div elements.
 
         Returns:
-        - list: A list of dictionaries containing article details.
+        - list: A list of dictionaries with the raw article fields.
         '''
 
-        while True:
+        if self.extraction_mode == "bulk":
             try:
-                # Wait until the "SHOW MORE" button is clickable and click on it
-                self.browser.click_element_when_clickable(show_more_button, timeout=2)
-            except:
-                # If the "SHOW MORE" button is not found or not clickable within the timeout period, break out of the loop
-                break
+                return self.utils.bulk_get_articles(
+                    article_divs,
+                    date_css=f".css-{self.date_locator}",
+                    title_css=f".css-{self.title_locator}",
+                    description_css=f".css-{self.description_locator}",
+                    image_css=f".css-{self.image_locator}",
+                )
+            except Exception as e:
+                print(f"Bulk extraction failed, falling back to per-element extraction: {e}")
+
+        return [self.collect_raw_article(div) for div in article_divs]
+
+    def collect_raw_article(self, div):
+        '''Collect the raw fields of a single article div, one WebDriver call per field.
+
+        Args:
+        - div (WebElement): The article root div element.
+
+        Returns:
+        - dict: The raw article fields.
+        '''
+
+        return {
+            "date": self.utils.safe_get_text(f"css:.css-{self.date_locator}", parent=div),
+            "title": self.utils.safe_get_text(f"css:.css-{self.title_locator}", parent=div),
+            "description": self.utils.safe_get_text(f"css:.css-{self.description_locator}", parent=div),
+            "image_url": self.utils.safe_get_image_url(f"css:.css-{self.image_locator}", parent=div),
+            "image_srcset": self.utils.safe_get_image_srcset(f"css:.css-{self.image_locator}", parent=div),
+        }
+
+    def iter_raw_articles(self):
+        '''Locate stage: yield the raw fields of every search result, loading more results as they are consumed.
+
+        Yields:
+        - dict: The raw article fields.
+        '''
+
+        for raw_articles in self.iter_raw_batches():
+            yield from raw_articles
+
+    def iter_raw_batches(self):
+        '''Yield the raw fields of the search results one "SHOW MORE" batch at a time.
+
+        Results are sorted newest first, so each batch is older than the previous one. The next batch is
+        only loaded when asked for, and pagination stops once a batch goes past the start date or reaches
+        articles the index already holds (delta mode). Sets `extraction_interrupted` if the results can no
+        longer be located.
+
+        Yields:
+        - list: The raw article fields of the batch.
+        '''
+
+        if self.categories_empty:
+            return
+
+        processed_count = 0
+        while True:
+            locating = ErrorHandlingContext("Error when locating article div elements")
+            with locating:
+                # Locate all root div elements for articles based on a structure commonality.
+                article_divs = self.browser.find_elements(self.root_div_elements_css)
+            if locating.error:
+                # Most likely the browser went away; keep the checkpoint so a rerun can resume
+                self.extraction_interrupted = True
+                return
+
+            new_divs = article_divs[processed_count:]
+            processed_count = len(article_divs)
+            raw_articles = self.collect_raw_articles(new_divs)
+            if raw_articles:
+                yield raw_articles
+
+            if not raw_articles or self.is_batch_older_than_range(raw_articles) or self.reached_indexed_articles:
+                return
+
+            if not self.load_more_articles(processed_count):
+                return
+
+    def skip_extracted_articles(self, articles):
+        '''Skip stage: drop the articles already extracted by an interrupted run or, in delta mode, by an earlier run.
+
+        Args:
+        - articles (iterable): The Article records.
+
+        Yields:
+        - Article: The articles still to extract.
+        '''
+
+        for article in articles:
+            # Already extracted by an interrupted run with the same payload and replayed from its checkpoint
+            if self.checkpoint and self.checkpoint.has(article):
+                metrics.increment("articles_resumed")
+                continue
+
+            # Already extracted by an earlier run of the same search, and everything older within the range was too.
+            # This run's own uncommitted rows are visible to the index connection, so a result repeated across
+            # "SHOW MORE" batches must not count, nor an earlier run that did not reach back to this search's start.
+            if (
+                self.delta
+                and article_hash(article.date, article.title) not in self.written_articles
+                and self.article_index.contains(self.search_key, article.date, article.title)
+                and self.article_index.covers(self.search_key, self.date_range.start, article.date)
+            ):
+                metrics.increment("articles_indexed")
+                self.reached_indexed_articles = True
+                continue
+
+            yield article
+
+    def build_pipeline(self, image_downloader):
+        '''Chain the extraction stages, from locating the results on the page to the downloaded images.
+
+        Args:
+        - image_downloader (ImageDownloader): The downloader the image URLs are handed to.
+
+        Returns:
+        - iterator: The Article records, ready to write, pulled one at a time.
+        '''
+
+        articles = self.prepare_articles(self.iter_raw_articles())
+        return fetch_images(articles, image_downloader, max_in_flight=self.image_downloads_config.get("max_in_flight", 32))
+
+    def prepare_articles(self, raw_articles):
+        '''Chain the stages between locating and downloading: parse, date filter, skip the known articles, enrich.
+
+        Args:
+        - raw_articles (iterable): The raw article fields.
+
+        Returns:
+        - iterator: The Article records whose image is still to download.
+        '''
+
+        articles = parse_articles(raw_articles, self.utils.date_parser, self.image_downloads_config.get("max_image_width"))
+        articles = filter_by_date(articles, self.date_range)
+        articles = self.skip_extracted_articles(articles)
+        return enrich_articles(articles, self.text_analyzer, self.search_phrase, self.tracked_phrases)
+
+    def is_batch_older_than_range(self, raw_articles):
+        '''Check whether the last (oldest) article of a loaded batch is older than the search start date.
+
+        Args:
+        - raw_articles (list): The raw articles of the batch, newest first.
+
+        Returns:
+        - bool: True if pagination can stop.
+        '''
+
+        return self.date_range.is_before(self.utils.date_parser.parse(raw_articles[-1]["date"]))
+
+    def load_more_articles(self, loaded_count, timeout=None):
+        '''Click "SHOW MORE" and wait until more than `loaded_count` articles are on the page.
+
+        Args:
+        - loaded_count (int): The number of articles currently loaded.
+        - timeout (int): Seconds to wait for the new batch to render, `timeouts.results_batch` by default.
+
+        Returns:
+        - bool: True if a new batch was loaded, False if there is nothing more to load.
+        '''
+
+        timeout = timeout or self.waiter.timeout("results_batch")
+
+        # The button is removed once every result is loaded, so this only waits at the end of the results
+        if not self.waiter.wait_for_any({"show_more_button": self.show_more_button}, self.waiter.timeout("show_more_button")):
+            # A failed wait is not the end of the results; keep the checkpoint and skip indexing so a rerun completes it
+            self.extraction_interrupted = self.extraction_interrupted or self.waiter.last_error is not None
+            return False
+
+        try:
+            self.browser.click_element(self.show_more_button)
+        except Exception as e:
+            print(f"Could not click SHOW MORE: {e}")
+            return False
+
+        if self.waiter.wait_for_count(self.root_div_elements_css, loaded_count, timeout):
+            return True
+        if self.waiter.last_error is not None:
+            self.extraction_interrupted = True
+            return False
+
+        print(f"No new articles loaded within {timeout} seconds after clicking SHOW MORE.")
+        return False
+
+    def output_article(self, article_data, writer):
+        '''Write one extracted article to the output and journal it in the checkpoint.
+
+        Args:
+        - article_data (Article): The article record, with its picture filename.
+        - writer (OutputSink): The output writer.
+
+        Returns:
+        - None
+        '''
+
+        with ErrorHandlingContext("Error when writing article"):
+            self.write_article(article_data, writer)
+            if self.checkpoint:
+                self.checkpoint.append(article_data, self.directory_output_path)
+
+    def write_article(self, article_data, writer):
+        '''Write one article to the output and add it to the article index, if enabled.
+
+        Args:
+        - article_data (dict): The article record, with its picture filename.
+        - writer (OutputSink): The output writer.
 
-        articles_data = []
-
-        with ErrorHandlingContext("Error when locating article div elements"):
-            # Locate all root div elements for articles based on a structure commonality.
-            article_divs = self.browser.find_elements(self.root_div_elements_css)
-
-        for div in article_divs:
-            with ErrorHandlingContext("Error when extracting article details"):
-                # Use the helper function
-                date = self.utils.text_to_formatted_date(self.utils.safe_get_text(f"css:.css-{self.date_locator}", parent=div))
-
-                # If date is out of the range, skip the current iteration
-                if not self.utils.is_date_in_range(date, self.search_dates_range):
-                    continue
-
-                title = self.utils.safe_get_text(f"css:.css-{self.title_locator}", parent=div)
-                description = self.utils.safe_get_text(f"css:.css-{self.description_locator}", parent=div)
-                image_url = self.utils.safe_get_image_url(f"css:.css-{self.image_locator}", parent=div)
-
-                # download image by the url
-                print(f"\nDownloading image with: date:{date}\ntitle:{title}\n")
-                picture_filename = self.utils.download_image_with_uuid(image_url, self.directory_output_path)
-
-                # Storing data in a dictionary and appending to the list
-                article_data = {
-                    "date": date,
-                    "title": title,
-                    "description": description,
-                    "picture_filename": picture_filename,
-                    "contains_money_format_on_title_or_description": self.utils.contains_money_format_on_title_or_description(title, description),
-                    "count_search_phrases": self.utils.count_search_phrases(title, description, self.search_phrase)
-                }
-                articles_data.append(article_data)
-
-        with ErrorHandlingContext("Error when filtering articles by date range and creating Excel"):
-            # As the datetime filter of nytimes is not working as expected, we need to filter the articles for the data range that we want
-            filtred_articles = self.filter_articles_by_search_dates_range(articles_data)
-            self.excel_handler.create_excel(filtred_articles)
-
-            # As the datetime filter of nytimes is not working as expected, we need to filter the articles for the data range that we want
-            filtred_articles = self.filter_articles_by_search_dates_range(articles_data)
-            self.excel_handler.create_excel(filtred_articles)
+        Returns:
+        - None
+        '''
+
+        writer.write(article_data)
+        if self.article_index:
+            self.article_index.add(self.search_key, article_data, self.directory_output_path)
+            self.written_articles.add(article_hash(article_data["date"], article_data["title"]))
+
+    def merge_indexed_articles(self, writer):
+        '''Write the indexed articles of the current search that this run did not extract again.
+
+        Their pictures are linked (or copied) into the current output directory, and the index
+        is updated to point at it, so older output folders can be deleted.
+
+        Args:
+        - writer (OutputSink): The output writer.
+
+        Returns:
+        - int: The number of indexed articles written.
+        '''
+
+        indexed_articles = list(self.article_index.articles(
+            self.search_key, self.date_range.start, self.date_range.end, exclude=self.written_articles
+        ))
+        for article_data, picture_directory in indexed_articles:
+            with ErrorHandlingContext("Error when merging indexed article"):
+                if bring_picture(article_data["picture_filename"], picture_directory, self.directory_output_path):
+                    picture_directory = self.directory_output_path
+                writer.write(article_data)
+                self.article_index.add(self.search_key, article_data, picture_directory)
+
+        metrics.increment("articles_from_index", len(indexed_articles))
+        return len(indexed_articles)
+
+    def open_checkpoint(self, writer):
+        '''Open the checkpoint journal of the current search and replay the articles it already holds.
+
+        The pictures of the replayed articles are linked (or copied) from the output directory of the
+        interrupted run into the current one.
+
+        Args:
+        - writer (OutputSink): The output writer the journaled articles are written to.
+
+        Returns:
+        - CheckpointJournal | None: The journal, or None when checkpointing is disabled.
+        '''
+
+        if not self.checkpoint_config.get("enabled", False):
+            return None
+
+        journal = CheckpointJournal(
+            self.checkpoint_config.get("directory", "./.checkpoints"),
+            self.input_wi,
+            self.search_dates_range,
+            fsync=self.checkpoint_config.get("fsync", False),
+        )
+        resumed_articles = journal.load()
+        for article_data, picture_directory in resumed_articles:
+            if picture_directory:
+                bring_picture(article_data["picture_filename"], picture_directory, self.directory_output_path)
+            self.write_article(article_data, writer)
+        if resumed_articles:
+            print(f"Resuming from checkpoint {journal.path} with {len(resumed_articles)} articles")
+
+        return journal
+
+    def extract_articles(self, writer=None):
+        '''Extract article details like title, date, and description from the search results page.
+
+        The articles stream through the stages of `build_pipeline` and are written to the output sink(s)
+        one at a time, so images download while the browser loads more results and memory stays flat.
+        With `run_mode` set to "async", `extract_articles_async` runs the same stages concurrently instead.
+
+        Args:
+        - writer (OutputSink): Optional sink to write to instead of the configured output formats.
+
+        Returns:
+        - None
+
+        Raises:
+        - ExtractionInterrupted: The results could not be loaded to the end; the partial output is still saved.
+        '''
+
+        if writer is None:
+            writer = open_output_sink(self.output_formats, self.directory_output_path, tracked_phrases=self.tracked_phrases)
+        self.reached_indexed_articles = False
+        self.written_articles = set()
+        self.extraction_interrupted = False
+        self.checkpoint = None
+        image_downloader = None
+
+        try:
+            image_downloader = ImageDownloader(
+                self.directory_output_path,
+                max_workers=self.image_downloads_config.get("max_workers", 8),
+                timeout=self.image_downloads_config.get("timeout", 10),
+                cache=self.image_cache,
+                scheduler=RequestScheduler.from_config(
+                    self.image_downloads_config.get("scheduler", {}), max_workers=self.image_downloads_config.get("max_workers", 8)
+                ),
+            )
+            self.checkpoint = self.open_checkpoint(writer)
+            if self.run_mode == "async":
+                import asyncio
+                from src.async_extraction import extract_articles_async
+
+                asyncio.run(extract_articles_async(self, image_downloader, writer))
+            else:
+                for article in self.build_pipeline(image_downloader):
+                    self.output_article(article, writer)
+        except BaseException:
+            # e.g. the browser session died, or the run was stopped while loading more results; the work item fails with this error
+            self.extraction_interrupted = True
+            raise
+        finally:
+            self.finish_extraction(image_downloader, writer)
+
+        # A partial report must not be released as done: the work item fails, and its retry resumes from the checkpoint
+        if self.extraction_interrupted:
+            raise ExtractionInterrupted("The search results could not be loaded to the end")
+
+    def finish_extraction(self, image_downloader, writer):
+        '''Index or roll back the written articles, settle the checkpoint and close the output and the downloader.
+
+        Args:
+        - image_downloader (ImageDownloader): The search's image downloader, None if it could not be created.
+        - writer (OutputSink): The search's output sink.
+
+        Returns:
+        - None
+        '''
+
+        if self.article_index:
+            # Only a completed search is indexed, so a delta run never stops short of articles nobody extracted
+            if self.extraction_interrupted:
+                with ErrorHandlingContext("Error when rolling back the article index"):
+                    self.article_index.rollback()
+            else:
+                with ErrorHandlingContext("Error when merging indexed articles"):
+                    if self.delta:
+                        print(f"Merged {self.merge_indexed_articles(writer)} indexed articles")
+                self.article_index.add_coverage(self.search_key, self.date_range.start, self.date_range.end)
+                self.article_index.commit()
+
+        if self.checkpoint:
+            if self.extraction_interrupted:
+                self.checkpoint.close()
+            else:
+                self.checkpoint.complete()
+
+        with ErrorHandlingContext("Error when saving the output files"):
+            writer.close()
+            print(f"Saved {writer.rows_written} articles to {writer.output_path}")
+
+        if image_downloader is None:
+            return
+        with ErrorHandlingContext("Error when closing the image downloader"):
+            image_downloader.close()
+            if self.image_cache:
+                print(f"Image cache stats: {self.image_cache.stats()}")
@@ -0,0 +1,271 @@
+import abc
+import csv
+import datetime
+import json
+import os
+
+from src.excel_handler import ARTICLE_COLUMNS, ExcelHandler
+
+
+class OutputSink(abc.ABC):
+    """
+    Base class for writers that stream article records to a file.
+
+    Subclasses implement `write_row` and `close`; `write` flattens an article record into
+    the same columns `ExcelHandler.transform_article_data` uses, plus one `count_<phrase>`
+    column per additionally tracked phrase.
+    """
+
+    def __init__(self, output_path: str, tracked_phrases=None):
+        self.output_path = output_path
+        self.tracked_phrases = list(tracked_phrases or [])
+        self.columns = ARTICLE_COLUMNS + [f"count_{phrase}" for phrase in self.tracked_phrases]
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, article: dict):
+        """
+        Append one article.
+
+        Args:
+        - article (dict): The article record.
+
+        Returns:
+        - None
+        """
+        phrase_counts = article.get("phrase_counts", {})
+        row = [article[key] for key in ARTICLE_COLUMNS] + [phrase_counts.get(phrase, 0) for phrase in self.tracked_phrases]
+        self.write_row(row)
+        self.rows_written += 1
+
+    @abc.abstractmethod
+    def write_row(self, row: list):
+        """Append one row of values in `self.columns` order."""
+
+    @abc.abstractmethod
+    def close(self):
+        """Flush and close the file."""
+
+
+class CsvSink(OutputSink):
+    """Writes articles as CSV rows, dates in ISO format."""
+
+    def __init__(self, output_path: str, tracked_phrases=None):
+        super().__init__(output_path, tracked_phrases)
+        self._file = open(output_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write_row(self, row: list):
+        self._writer.writerow([value.isoformat() if hasattr(value, "isoformat") else value for value in row])
+
+    def close(self):
+        self._file.close()
+
+
+class JsonLinesSink(OutputSink):
+    """Writes one JSON object per article per line, dates in ISO format."""
+
+    def __init__(self, output_path: str, tracked_phrases=None):
+        super().__init__(output_path, tracked_phrases)
+        self._file = open(output_path, "w", encoding="utf-8")
+
+    def write_row(self, row: list):
+        self._file.write(json.dumps(dict(zip(self.columns, row)), default=lambda value: value.isoformat(), ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink(OutputSink):
+    """
+    Writes articles to a Parquet file with typed columns.
+
+    Rows are buffered and flushed as one row group every `row_group_size` rows, so memory
+    stays bounded. Requires `pyarrow`.
+    """
+
+    def __init__(self, output_path: str, tracked_phrases=None, row_group_size: int = 10_000):
+        super().__init__(output_path, tracked_phrases)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("The parquet output format requires the 'pyarrow' package.") from e
+
+        self._pyarrow = pyarrow
+        self.row_group_size = row_group_size
+        self.schema = pyarrow.schema(
+            [
+                ("title", pyarrow.string()),
+                ("date", pyarrow.date32()),
+                ("description", pyarrow.string()),
+                ("picture_filename", pyarrow.string()),
+                ("contains_money_format_on_title_or_description", pyarrow.bool_()),
+                ("count_search_phrases", pyarrow.int64()),
+            ]
+            + [(f"count_{phrase}", pyarrow.int64()) for phrase in self.tracked_phrases]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(output_path, self.schema)
+        self._buffer = []
+
+    def write_row(self, row: list):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        columns = [list(column) for column in zip(*self._buffer)]
+        self._writer.write_table(self._pyarrow.Table.from_arrays(columns, schema=self.schema))
+        self._buffer = []
+
+
+class RecordSink:
+    """
+    Writes the full article records as JSON Lines, e.g. to hand a search shard to another step.
+
+    Unlike `JsonLinesSink`, which writes the report columns, every field of the record is
+    kept, so `read_records` gives back the same records.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.rows_written = 0
+        self._file = open(output_path, "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, article: dict):
+        self._file.write(json.dumps(dict(article), default=lambda value: value.isoformat(), ensure_ascii=False))
+        self._file.write("\n")
+        self.rows_written += 1
+
+    def close(self):
+        self._file.close()
+
+
+def read_records(path: str):
+    """
+    Read back the article records written by a RecordSink.
+
+    Args:
+    - path (str): The JSON Lines file.
+
+    Yields:
+    - dict: The article records, with their date parsed.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                article = json.loads(line)
+                article["date"] = datetime.date.fromisoformat(article["date"])
+                yield article
+
+
+class MemorySink:
+    """Keeps the written article records in a list, e.g. to return them from a worker process."""
+
+    def __init__(self):
+        self.output_path = "memory"
+        self.articles = []
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, article: dict):
+        self.articles.append(dict(article))
+        self.rows_written += 1
+
+    def close(self):
+        pass
+
+
+class MultiSink:
+    """Fans every article out to several sinks."""
+
+    def __init__(self, sinks: list):
+        self.sinks = sinks
+        self.output_path = ", ".join(sink.output_path for sink in sinks)
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, article: dict):
+        for sink in self.sinks:
+            sink.write(article)
+        self.rows_written += 1
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_output_sink(output_formats, output_directory: str, tracked_phrases=None, basename: str = "articles"):
+    """
+    Open the sink(s) for the requested output format(s).
+
+    Args:
+    - output_formats (str | list): One or more of "xlsx", "csv", "jsonl", "parquet".
+    - output_directory (str): Directory the files are written to, named `<basename>.<format>`.
+    - tracked_phrases (list): Additional tracked phrases, written as `count_<phrase>` columns.
+    - basename (str): File name without extension.
+
+    Returns:
+    - OutputSink | ExcelStreamWriter: A single sink, or a MultiSink writing to all of them.
+
+    Raises:
+    - ValueError: If a format is unknown; the sinks already opened are closed.
+    """
+    if isinstance(output_formats, str):
+        output_formats = [output_formats]
+
+    os.makedirs(output_directory, exist_ok=True)
+
+    sinks = []
+    try:
+        for output_format in output_formats:
+            output_path = os.path.join(output_directory, f"{basename}.{output_format}")
+            if output_format == "xlsx":
+                sinks.append(ExcelHandler().open_writer(output_path, tracked_phrases=tracked_phrases))
+            elif output_format in SINKS:
+                sinks.append(SINKS[output_format](output_path, tracked_phrases))
+            else:
+                raise ValueError(f"Unknown output format '{output_format}'. Use one of: xlsx, {', '.join(SINKS)}.")
+    except BaseException:
+        # e.g. pyarrow is missing for the second format; do not leave the first one's file open
+        for sink in sinks:
+            sink.close()
+        raise
+
+    return sinks[0] if len(sinks) == 1 else MultiSink(sinks)
@@ -0,0 +1,151 @@
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.checkpoint import article_key
+from src.date_engine import DateRange
+from src.output_sinks import MemorySink, open_output_sink
+
+
+def split_date_range(date_range: DateRange, shard_by="month") -> list:
+    """
+    Split a date range into contiguous, non-overlapping sub-ranges.
+
+    Args:
+    - date_range (DateRange): The range to split.
+    - shard_by (str | int): "month", "week", or a number of days per shard.
+
+    Returns:
+    - list: DateRange shards, newest first.
+    """
+    from dateutil.relativedelta import relativedelta
+
+    shards = []
+    cursor = date_range.start
+    while cursor <= date_range.end:
+        if shard_by == "month":
+            shard_end = cursor + relativedelta(day=31)
+        elif shard_by == "week":
+            shard_end = cursor + datetime.timedelta(days=6)
+        else:
+            shard_end = cursor + datetime.timedelta(days=int(shard_by) - 1)
+
+        shard_end = min(shard_end, date_range.end)
+        shards.append(DateRange(cursor, shard_end))
+        cursor = shard_end + datetime.timedelta(days=1)
+
+    return list(reversed(shards))
+
+
+def search_shard(payload: dict, output_directory: str) -> list:
+    """
+    Run one search shard on its own headless browser. Executed in a worker process.
+
+    Args:
+    - payload (dict): The work item payload, with `search_dates_range` set to the shard.
+    - output_directory (str): Directory the shard's images are saved to.
+
+    Returns:
+    - list: The article records of the shard.
+
+    Raises:
+    - RuntimeError: If the website could not be opened or the search results could not be read to the end.
+    """
+    # Imported here because src.nyt_pages imports this module
+    from RPA.Browser.Selenium import Selenium
+    from src.nyt_pages import SearchResultsPage
+
+    browser = Selenium()
+    try:
+        page = SearchResultsPage(browser, payload=payload, output_directory=output_directory)
+        # The parent process indexes the merged result; shards always search their whole range
+        if page.article_index:
+            page.article_index.close()
+        page.article_index = None
+        page.delta = False
+        # Each process would keep its own index of the shared cache directory and overwrite the others' on save
+        page.image_cache = None
+        # An empty shard would be merged and recorded as covered, so a shard that could not search fails
+        if not page.open_the_website(page.base_url, isolated=True):
+            raise RuntimeError(f"Could not open {page.base_url} for the shard {payload.get('search_dates_range')}")
+        page.apply_filters()
+
+        sink = MemorySink()
+        page.extract_articles(writer=sink)
+        if page.extraction_interrupted:
+            raise RuntimeError(f"The shard {payload.get('search_dates_range')} could not be searched to the end")
+        return sink.articles
+    finally:
+        browser.close_all_browsers()
+
+
+def merge_articles(shard_results: list) -> list:
+    """
+    Merge the articles of several shards, dropping duplicates and sorting newest first.
+
+    Args:
+    - shard_results (list): One list of article records per shard.
+
+    Returns:
+    - list: The merged article records.
+    """
+    merged = {}
+    for articles in shard_results:
+        for article in articles:
+            # A relative date ("5h ago") near a shard boundary can put the same article in two shards
+            merged.setdefault(article_key(article), article)
+
+    return sorted(merged.values(), key=lambda article: article["date"], reverse=True)
+
+
+def run_sharded_search(page) -> int:
+    """
+    Search the page's current work item by date shards in a pool of browser processes and write the merged result once.
+
+    Args:
+    - page (SearchResultsPage): The page holding the loaded work item and the `parallel` config.
+
+    Returns:
+    - int: The number of articles written.
+
+    Raises:
+    - RuntimeError: Some shards failed; nothing is written or indexed.
+    """
+    shards = split_date_range(page.date_range, page.parallel_config.get("shard_by", "month"))
+    pool_size = min(page.parallel_config.get("pool_size") or os.cpu_count(), len(shards))
+    print(f"Searching {len(shards)} date shards with {pool_size} browsers")
+
+    shard_results = []
+    failed_shards = []
+    with ProcessPoolExecutor(max_workers=pool_size) as pool:
+        futures = {}
+        for shard in shards:
+            shard_dates_range = shard.to_search_dates_range()
+            payload = dict(page.input_wi, search_dates_range=shard_dates_range)
+            futures[pool.submit(search_shard, payload, page.directory_output_path)] = shard_dates_range
+
+        for future in as_completed(futures):
+            try:
+                shard_results.append(future.result())
+            except Exception as e:
+                print(f"Error when searching shard {futures[future]}. Original error: {str(e)}")
+                failed_shards.append(futures[future])
+
+    # A report without some date ranges would look complete; fail the work item instead
+    if failed_shards:
+        failed_ranges = ", ".join(f"{shard['start_date']}-{shard['end_date']}" for shard in failed_shards)
+        raise RuntimeError(f"{len(failed_shards)} of {len(shards)} shards failed: {failed_ranges}")
+
+    articles = merge_articles(shard_results)
+    page.written_articles = set()
+    with open_output_sink(page.output_formats, page.directory_output_path, tracked_phrases=page.tracked_phrases) as writer:
+        for article in articles:
+            page.write_article(article, writer)
+        if page.delta:
+            print(f"Merged {page.merge_indexed_articles(writer)} indexed articles")
+    if page.article_index:
+        page.article_index.add_coverage(page.search_key, page.date_range.start, page.date_range.end)
+        page.article_index.commit()
+
+    print(f"Saved {len(articles)} articles to {writer.output_path}")
+    return len(articles)
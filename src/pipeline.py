@@ -0,0 +1,128 @@
+"""
+Streaming stages of the article extraction.
+
+Each stage is a generator that takes an iterable of articles and yields articles, so a
+search is a chain of stages pulled one article at a time by the sink:
+
+    locate (SearchResultsPage.iter_raw_articles) -> parse_articles -> filter_by_date
+    -> skip known (SearchResultsPage.skip_extracted_articles) -> enrich_articles
+    -> fetch_images -> sink
+
+Nothing upstream runs until the sink asks for the next article. The only buffer is the
+window of image downloads in flight in `fetch_images`, so memory does not grow with the
+number of results. Stages can be swapped, or timed on their own with synthetic input
+(see `benchmarks/bench_pipeline.py`).
+"""
+from collections import deque
+
+from src.article import Article
+from src.utility import ErrorHandlingContext, Utility, metrics
+
+
+def parse_articles(raw_articles, date_parser, max_image_width=None):
+    """
+    Turn raw article fields into Article records with a parsed date and the image rendition to download.
+
+    Args:
+    - raw_articles (iterable): Dictionaries with `date`, `title`, `description`, `image_url` and, optionally, `image_srcset`.
+    - date_parser (DateParser): Parser of the NYT date strings.
+    - max_image_width (int): Widest image rendition wanted, see `Utility.select_image_rendition`.
+
+    Yields:
+    - Article: The record; its date is None if it could not be parsed.
+    """
+    for raw_article in raw_articles:
+        parsing = ErrorHandlingContext("Error when extracting article details")
+        with parsing:
+            image_url, picture_width = Utility.select_image_rendition(
+                raw_article["image_url"], raw_article.get("image_srcset", ""), max_image_width
+            )
+            article = Article(
+                date_parser.parse(raw_article["date"]),
+                raw_article["title"],
+                raw_article["description"],
+                image_url=image_url,
+                picture_width=picture_width,
+            )
+        if not parsing.error:
+            yield article
+
+
+def filter_by_date(articles, date_range):
+    """
+    Drop the articles whose date is unknown or outside the search range.
+
+    Args:
+    - articles (iterable): The Article records.
+    - date_range (DateRange): The search range.
+
+    Yields:
+    - Article: The articles within the range.
+    """
+    for article in articles:
+        # The datetime filter of nytimes is not working as expected, so out-of-range dates show up in the results
+        if article.date in date_range:
+            metrics.increment("articles_kept")
+            yield article
+        else:
+            metrics.increment("articles_discarded")
+
+
+def enrich_articles(articles, text_analyzer, search_phrase: str, tracked_phrases=()):
+    """
+    Add the money flag and the phrase counts, from one scan of the title and description.
+
+    Args:
+    - articles (iterable): The Article records.
+    - text_analyzer (TextAnalyzer): Analyzer built for the search phrase and the tracked phrases.
+    - search_phrase (str): The phrase counted in `count_search_phrases`.
+    - tracked_phrases (list): The additional phrases counted in `phrase_counts`.
+
+    Yields:
+    - Article: The enriched records.
+    """
+    for article in articles:
+        enriching = ErrorHandlingContext("Error when analyzing article text")
+        with enriching:
+            analysis = text_analyzer.analyze(article.title, article.description)
+            article.contains_money_format_on_title_or_description = analysis["contains_money_format_on_title_or_description"]
+            article.count_search_phrases = analysis["phrase_counts"].get(search_phrase, 0)
+            article.phrase_counts = {phrase: analysis["phrase_counts"].get(phrase, 0) for phrase in tracked_phrases}
+        if not enriching.error:
+            yield article
+
+
+def fetch_images(articles, image_downloader, max_in_flight: int = 32):
+    """
+    Download the images while the articles keep flowing, holding back at most `max_in_flight` articles.
+
+    An article is yielded once its image is saved, in the order the articles came in. When the
+    window is full, the oldest download is waited for before pulling the next article, which
+    also holds back the browser from loading more results than the downloads can keep up with.
+
+    Args:
+    - articles (iterable): The Article records.
+    - image_downloader (ImageDownloader): The downloader the image URLs are handed to.
+    - max_in_flight (int): The most articles waiting for their image at once.
+
+    Yields:
+    - Article: The records, with `picture_filename` set to the saved filename ('' if there is none).
+    """
+    in_flight = deque()
+    for article in articles:
+        article.picture_filename = image_downloader.submit(article.image_url)
+        in_flight.append(article)
+        if len(in_flight) >= max_in_flight:
+            yield _resolve_picture(in_flight.popleft())
+
+    while in_flight:
+        yield _resolve_picture(in_flight.popleft())
+
+
+def _resolve_picture(article: Article) -> Article:
+    try:
+        article.picture_filename = article.picture_filename.result()
+    except Exception as e:
+        print(f"Error when saving the image of {article.title!r}. Original error: {str(e)}")
+        article.picture_filename = ''
+    return article
@@ -0,0 +1,365 @@
+"""
+Adaptive, rate-limited scheduling of HTTP requests, shared by the threads that send them.
+
+Every host gets its own limits, adjusted from the responses it sends back:
+- a token bucket caps the request rate. It starts at the configured `rate` (unbounded when
+  None). A throttling response (429, or 503 with a Retry-After) halves it from the rate
+  actually achieved, and every success raises it by `rate_increase` requests per second per
+  second, up to `rate`.
+- a concurrency limit caps the requests in flight. It starts at `max_concurrency`, is halved
+  on a throttling or server error or a latency spike, and grows by one per limit's worth of
+  successes (additive increase, multiplicative decrease). Decreases happen at most once per
+  typical response time, so a burst of errors from requests already in flight counts once.
+- failed attempts (throttling, 5xx, connection errors) are retried up to `max_retries` times
+  after a random "full jitter" backoff, or the server's Retry-After if longer.
+- a circuit breaker opens after `breaker_threshold` consecutive server errors (other 5xx) or
+  connection errors. While it is open, requests to the host fail at once; after
+  `breaker_cooldown` seconds one probe request is let through, and its success closes it again.
+
+The counters are mirrored to the run metrics; `stats` reports them with the achieved throughput.
+"""
+import http.client
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from src.utility import metrics
+
+
+class CircuitOpenError(IOError):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Token bucket rate limit: `rate` tokens per second, up to `burst` saved up. A rate of None means no limit.
+    """
+
+    def __init__(self, rate: float = None, burst: int = 10):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.rate is None:
+                    return
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every request for `seconds`, e.g. for a Retry-After."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class HostState:
+    """The adaptive limits, latency estimate and circuit breaker of one host."""
+
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency_limit = float(concurrency)
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        # Exponentially weighted average of the response time of successful requests
+        self.latency = None
+        self.latency_samples = 0
+        self.last_decrease = 0.0
+        self.sent = deque()
+        self.consecutive_failures = 0
+        self.breaker_open = False
+        self.open_until = 0.0
+        self.probing = False
+
+
+class RequestScheduler:
+    """
+    Sends requests through per-host adaptive limits, retries and circuit breakers.
+
+    Args:
+    - rate (float): Most requests per second per host, None for no cap (the first throttling response sets one).
+    - burst (int): Requests a host's token bucket can save up.
+    - rate_increase (float): Requests per second the rate grows by, per second of successes.
+    - min_concurrency (int): The concurrency limit never drops below this.
+    - max_concurrency (int): Starting and highest concurrency limit per host.
+    - max_retries (int): Retries of a failed attempt before giving up.
+    - backoff_base (float): Backoff of the first retry, in seconds; it doubles with each retry.
+    - backoff_max (float): Longest backoff, Retry-After included.
+    - breaker_threshold (int): Consecutive 5xx or connection errors that open a host's circuit breaker.
+    - breaker_cooldown (float): Seconds the breaker stays open before a probe request.
+    - latency_spike_factor (float): A response this many times slower than the average counts as congestion.
+    """
+
+    DECREASE_FACTOR = 0.5
+    LATENCY_WEIGHT = 0.1
+    MIN_LATENCY_SAMPLES = 20
+    # Below this, a slower response is jitter rather than congestion, however fast the average is
+    MIN_LATENCY_SPIKE = 0.05
+
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = 10,
+        rate_increase: float = 10,
+        min_concurrency: int = 1,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 15,
+        latency_spike_factor: float = 4,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.rate_increase = rate_increase
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.latency_spike_factor = latency_spike_factor
+        self.hosts = {}
+        self.counters = dict.fromkeys(
+            ["requests", "succeeded", "failed", "retries", "throttled", "server_errors",
+             "connection_errors", "latency_spikes", "breaker_opened", "breaker_rejections"], 0
+        )
+        self.started = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, scheduler_config: dict, max_workers: int = 8):
+        """
+        Create the scheduler described by the `image_downloads.scheduler` config section.
+
+        Returns:
+        - RequestScheduler | None: The scheduler, or None when it is disabled.
+        """
+        if not scheduler_config.get("enabled", True):
+            return None
+        options = {key: value for key, value in scheduler_config.items() if key != "enabled"}
+        options.setdefault("max_concurrency", max_workers)
+        return cls(**options)
+
+    def request(self, url: str, send):
+        """
+        Send a request through the limits of its host, retrying the failed attempts.
+
+        Args:
+        - url (str): The URL; its host selects the limits.
+        - send (callable): Sends the request once and returns `(status, headers, body)`.
+
+        Returns:
+        - tuple: The `(status, headers, body)` of the last attempt, which may still be an error status.
+
+        Raises:
+        - CircuitOpenError: The host's circuit breaker is open.
+        - Exception: The connection error of the last attempt.
+        """
+        host = self._host(urlsplit(url).netloc)
+        for attempt in range(self.max_retries + 1):
+            self._acquire(host)
+            if attempt:
+                self._count("retries")
+            started = time.monotonic()
+            connection_error = None
+            try:
+                response = send()
+            except (OSError, http.client.HTTPException) as e:
+                connection_error = e
+            except BaseException:
+                # Anything else is not the host's fault, but a pending probe must not keep its breaker shut for good
+                self._abandon_probe(host)
+                raise
+            finally:
+                self._release(host)
+
+            if connection_error is not None:
+                self._count("connection_errors")
+                self._on_failure(host)
+                if attempt == self.max_retries:
+                    self._count("failed")
+                    raise connection_error
+                time.sleep(self._backoff(attempt))
+                continue
+
+            status, headers, _ = response
+            if status == 429 or status >= 500:
+                if status == 429 or (status == 503 and "Retry-After" in headers):
+                    self._count("throttled")
+                    self._on_throttled(host)
+                else:
+                    self._count("server_errors")
+                    self._on_failure(host)
+                if attempt == self.max_retries:
+                    self._count("failed")
+                    return response
+                retry_after = self._retry_after(headers)
+                if retry_after:
+                    host.bucket.pause(retry_after)
+                time.sleep(max(self._backoff(attempt), retry_after))
+                continue
+
+            self._on_success(host, time.monotonic() - started)
+            self._count("succeeded")
+            return response
+
+    def stats(self) -> dict:
+        """
+        The counters of the scheduled requests, the achieved throughput and each host's current limits.
+
+        Returns:
+        - dict: `requests` (attempts), `succeeded`, `failed`, `retries`, `throttled`, `server_errors`,
+          `connection_errors`, `latency_spikes`, `breaker_opened`, `breaker_rejections`,
+          `seconds`, `succeeded_per_second` and `hosts`.
+        """
+        with self._lock:
+            stats = dict(self.counters)
+        seconds = time.monotonic() - self.started if self.started else 0
+        stats["seconds"] = round(seconds, 3)
+        stats["succeeded_per_second"] = round(stats["succeeded"] / seconds, 2) if seconds else 0
+        stats["hosts"] = {
+            netloc: {
+                "rate": round(host.bucket.rate, 2) if host.bucket.rate is not None else None,
+                "concurrency_limit": round(host.concurrency_limit, 2),
+                "breaker_open": host.breaker_open,
+            }
+            for netloc, host in list(self.hosts.items())
+        }
+        return stats
+
+    def _host(self, netloc: str) -> HostState:
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+            if netloc not in self.hosts:
+                self.hosts[netloc] = HostState(self.rate, self.burst, self.max_concurrency)
+            return self.hosts[netloc]
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+        metrics.increment(f"scheduled_{name}")
+
+    def _acquire(self, host: HostState):
+        with host.condition:
+            while True:
+                if host.breaker_open:
+                    if time.monotonic() < host.open_until or host.probing:
+                        self._count("breaker_rejections")
+                        raise CircuitOpenError("The circuit breaker of the host is open")
+                    # Half-open: this request is the probe
+                    host.probing = True
+                    break
+                if host.in_flight < max(self.min_concurrency, int(host.concurrency_limit)):
+                    break
+                host.condition.wait()
+            host.in_flight += 1
+        host.bucket.acquire()
+        with host.condition:
+            now = time.monotonic()
+            host.sent.append(now)
+            while host.sent and host.sent[0] < now - 1:
+                host.sent.popleft()
+        self._count("requests")
+
+    def _release(self, host: HostState):
+        with host.condition:
+            host.in_flight -= 1
+            host.condition.notify_all()
+
+    def _abandon_probe(self, host: HostState):
+        with host.condition:
+            if host.probing:
+                # Let the next request probe the host again
+                host.probing = False
+                host.condition.notify_all()
+
+    def _on_success(self, host: HostState, latency: float):
+        with host.condition:
+            if host.probing or host.breaker_open:
+                host.breaker_open = host.probing = False
+            host.consecutive_failures = 0
+
+            if (
+                host.latency_samples >= self.MIN_LATENCY_SAMPLES
+                and latency > self.latency_spike_factor * host.latency
+                and latency - host.latency > self.MIN_LATENCY_SPIKE
+            ):
+                spike = True
+            else:
+                spike = False
+                host.concurrency_limit = min(self.max_concurrency, host.concurrency_limit + 1 / host.concurrency_limit)
+                if host.bucket.rate is not None:
+                    rate = host.bucket.rate + self.rate_increase / host.bucket.rate
+                    host.bucket.rate = min(self.rate, rate) if self.rate is not None else rate
+            host.latency = latency if host.latency is None else host.latency + self.LATENCY_WEIGHT * (latency - host.latency)
+            host.latency_samples += 1
+            if spike:
+                self._decrease(host, rate=False)
+        if spike:
+            self._count("latency_spikes")
+
+    def _on_throttled(self, host: HostState):
+        with host.condition:
+            self._decrease(host, rate=True)
+            if host.probing:
+                # The host is still overloaded: keep the breaker open for another cooldown
+                host.probing = False
+                host.open_until = time.monotonic() + self.breaker_cooldown
+                host.condition.notify_all()
+
+    def _on_failure(self, host: HostState):
+        opened = False
+        with host.condition:
+            host.consecutive_failures += 1
+            self._decrease(host, rate=False)
+            if host.probing or (not host.breaker_open and host.consecutive_failures >= self.breaker_threshold):
+                host.breaker_open, host.probing, opened = True, False, True
+                host.open_until = time.monotonic() + self.breaker_cooldown
+                host.condition.notify_all()
+        if opened:
+            self._count("breaker_opened")
+
+    def _decrease(self, host: HostState, rate: bool):
+        """Multiplicative decrease of the concurrency limit (and the rate), at most once per typical response time."""
+        now = time.monotonic()
+        if now - host.last_decrease < max(host.latency or 0, 0.05):
+            return
+        host.last_decrease = now
+        host.concurrency_limit = max(self.min_concurrency, host.concurrency_limit * self.DECREASE_FACTOR)
+        if rate:
+            # Halve the rate the host actually took, not the cap, which may be far above it or unbounded
+            # The last second of sends, or less right after the first request
+            span = max(now - host.sent[0], 0.05) if host.sent else 1
+            achieved = max(len(host.sent) / min(span, 1), 1)
+            current = host.bucket.rate if host.bucket.rate is not None else achieved
+            host.bucket.rate = max(1.0, min(current, achieved) * self.DECREASE_FACTOR)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, headers) -> float:
+        try:
+            return min(self.backoff_max, float(headers.get("Retry-After", 0)))
+        except (TypeError, ValueError):
+            # The HTTP-date form is not worth parsing for a capped wait
+            return 0
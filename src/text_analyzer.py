@@ -0,0 +1,108 @@
+import re
+from collections import deque
+
+# Money formats: $11.1 | $111,111.11 | 11 dollars | 11 USD
+MONEY_PATTERN = re.compile(r"(\$[\d,]+(\.\d{1,2})?)|(\d+\s(dollars|USD))")
+
+# Joins title and description so one scan covers both without matches spanning them.
+FIELD_SEPARATOR = "\0"
+
+
+class TextAnalyzer:
+    """
+    Counts several search phrases and detects money mentions in one pass per article.
+
+    The phrases are compiled once into an Aho-Corasick automaton over their lowercased
+    form, so the cost of a scan does not grow with the number of phrases. Counts follow
+    `str.count` semantics: case-insensitive and non-overlapping, per phrase.
+    """
+
+    def __init__(self, phrases: list):
+        # Keep the configured order and drop empty or repeated phrases
+        self.phrases = list(dict.fromkeys(phrase for phrase in phrases if phrase))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._build_automaton()
+
+    def analyze(self, title: str, description: str) -> dict:
+        """
+        Analyze the title and description of an article.
+
+        Args:
+        - title (str): The article title.
+        - description (str): The article description.
+
+        Returns:
+        - dict: `phrase_counts` (occurrences per phrase) and `contains_money_format_on_title_or_description`.
+        """
+
+        text = f"{title}{FIELD_SEPARATOR}{description}"
+        return {
+            "phrase_counts": self.count_phrases(text.lower()),
+            "contains_money_format_on_title_or_description": MONEY_PATTERN.search(text) is not None,
+        }
+
+    def analyze_batch(self, articles: list) -> list:
+        """
+        Analyze a list of articles.
+
+        Args:
+        - articles (list): Dictionaries with `title` and `description` keys.
+
+        Returns:
+        - list: One `analyze` result per article, in the same order.
+        """
+
+        return [self.analyze(article["title"], article["description"]) for article in articles]
+
+    def count_phrases(self, text: str) -> dict:
+        """
+        Count every phrase in an already lowercased text with a single scan.
+
+        Args:
+        - text (str): The lowercased text.
+
+        Returns:
+        - dict: Occurrences per phrase.
+        """
+
+        counts = dict.fromkeys(self.phrases, 0)
+        # End position of the last counted match per phrase, to skip overlapping matches
+        last_end = dict.fromkeys(self.phrases, -1)
+        goto, fail, output = self._goto, self._fail, self._output
+
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for phrase, length in output[state]:
+                if position - length >= last_end[phrase]:
+                    counts[phrase] += 1
+                    last_end[phrase] = position
+
+        return counts
+
+    def _build_automaton(self):
+        for phrase in self.phrases:
+            state = 0
+            for char in phrase.lower():
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((phrase, len(phrase.lower())))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
@@ -1,10 +1,23 @@
 import uuid
 import os
-import urllib
-from dateutil.relativedelta import relativedelta
+import urllib.request
 import datetime
 import re
 import functools
+import json
+import threading
+import time
+from urllib.parse import urljoin
+from src.date_engine import DateParser
+from src.text_analyzer import MONEY_PATTERN
+
+# A category label is its name followed by the number of results, e.g. "Sports910" or "Sports\n1,024"
+CATEGORY_LABEL_PATTERN = re.compile(r"^(?P<name>.*?)\s*(?P<count>\d[\d,]*)?$", re.S)
+
+# A srcset candidate is a URL up to the first whitespace, then its descriptors up to the next comma outside
+# parentheses, as the HTML spec parses it; a comma right after a URL is part of it unless it ends the URL
+SRCSET_URL_PATTERN = re.compile(r"[\s,]*(\S*)")
+SRCSET_DESCRIPTORS_PATTERN = re.compile(r"((?:[^,(]|\([^)]*\)?)*),?")
 
 class Utility:
     """
@@ -13,6 +26,7 @@ class Utility:
 
     def __init__(self, browser):
         self.browser = browser
+        self.date_parser = DateParser()
 
     
     def safe_get_text(self, element, parent=None) -> str:
@@ -48,16 +62,189 @@ class Utility:
             return self.browser.get_element_attribute(image_element, "src")
         except:
             return ''
-        
+
+    def safe_get_image_srcset(self, element, parent=None) -> str:
+        """
+        Safely extract the `srcset` (list of image renditions) from a given web element.
+
+        Parameters:
+        - element: The web element from which the srcset is to be extracted.
+
+        Returns:
+        - str: The srcset, or an empty string if the image has none.
+        """
+
+        try:
+            image_element = self.browser.find_element(element, parent=parent)
+            return self.browser.get_element_attribute(image_element, "srcset") or ''
+        except:
+            return ''
+
+    @staticmethod
+    def select_image_rendition(src: str, srcset: str, max_width=None) -> tuple:
+        """
+        Pick the image rendition to download from an image's `srcset`.
+
+        Takes the widest rendition that is not wider than `max_width`, or the narrowest one
+        if they are all wider. Falls back to `src` when there is no `max_width` or the srcset
+        has no width (`w`) descriptors.
+
+        Parameters:
+        - src: The image `src` URL.
+        - srcset: The image `srcset`, e.g. "a.jpg?w=150 150w, a.jpg?w=600 600w".
+        - max_width: The widest rendition wanted, in pixels.
+
+        Returns:
+        - tuple: The URL to download and its width (None when unknown).
+        """
+
+        if not max_width or not srcset:
+            return src, None
+
+        renditions = []
+        for url, descriptors in Utility.parse_srcset(srcset):
+            if len(descriptors) == 1 and descriptors[0].endswith("w") and descriptors[0][:-1].isdigit():
+                renditions.append((int(descriptors[0][:-1]), urljoin(src, url)))
+
+        if not renditions:
+            return src, None
+
+        fitting = [rendition for rendition in renditions if rendition[0] <= max_width]
+        width, url = max(fitting) if fitting else min(renditions)
+        return url, width
+
+    @staticmethod
+    def parse_srcset(srcset: str) -> list:
+        """
+        Split a `srcset` into its image candidates the way browsers do.
+
+        Parameters:
+        - srcset: The image `srcset`, e.g. "a.jpg 150w,b.jpg 600w".
+
+        Returns:
+        - list: (URL, list of descriptors) tuples, in order.
+        """
+
+        candidates = []
+        position = 0
+        while True:
+            match = SRCSET_URL_PATTERN.match(srcset, position)
+            url, position = match.group(1), match.end()
+            if not url:
+                return candidates
+            if url.endswith(","):
+                # A URL that ends in commas has no descriptors; the next candidate starts right after it
+                candidates.append((url.rstrip(","), []))
+                continue
+            match = SRCSET_DESCRIPTORS_PATTERN.match(srcset, position)
+            candidates.append((url, match.group(1).split()))
+            position = match.end()
+
 
     
-    def download_image_with_uuid(self, url: str, save_path: str) -> str:
+    # Script run in the browser to read every article's fields in one round trip.
+    # Mirrors `safe_get_text` (rendered, trimmed text) and `safe_get_image_url` (resolved `src`),
+    # returning '' for any missing element.
+    BULK_ARTICLES_SCRIPT = """
+        var divs = arguments[0];
+        var selectors = arguments[1];
+        function text(root, css) {
+            var el = root.querySelector(css);
+            return el ? (el.innerText || el.textContent || '').trim() : '';
+        }
+        function src(root, css) {
+            var el = root.querySelector(css);
+            return el && el.src ? el.src : '';
+        }
+        function srcset(root, css) {
+            var el = root.querySelector(css);
+            return el ? (el.getAttribute('srcset') || '') : '';
+        }
+        return Array.prototype.map.call(divs, function (div) {
+            return {
+                date: text(div, selectors.date),
+                title: text(div, selectors.title),
+                description: text(div, selectors.description),
+                image_url: src(div, selectors.image),
+                image_srcset: srcset(div, selectors.image)
+            };
+        });
+    """
+
+    def bulk_get_articles(self, article_divs, date_css: str, title_css: str, description_css: str, image_css: str) -> list:
+        """
+        Extract the raw fields of every article div with a single injected script.
+
+        Parameters:
+        - article_divs: The article root div elements.
+        - date_css, title_css, description_css, image_css: CSS selectors (without the `css:` prefix) of each field.
+
+        Returns:
+        - list: One dictionary per div with `date`, `title`, `description`, `image_url` and `image_srcset` keys.
+        """
+
+        if not article_divs:
+            return []
+
+        selectors = {"date": date_css, "title": title_css, "description": description_css, "image": image_css}
+        return self.browser.driver.execute_script(self.BULK_ARTICLES_SCRIPT, list(article_divs), selectors)
+
+    # Script run in the browser to read, and optionally toggle, every category checkbox in one round trip.
+    # `arguments[0]` is the XPath of the category label spans, `arguments[1]` the indexes of the checkboxes to click.
+    CATEGORY_STATES_SCRIPT = """
+        var spans = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var toggle = arguments[1] || [];
+        function checkbox(index) {
+            var label = spans.snapshotItem(index).closest('label');
+            return label ? label.querySelector('input[type="checkbox"]') : null;
+        }
+        toggle.forEach(function (index) {
+            var input = checkbox(index);
+            if (input) { input.click(); }
+        });
+        var states = [];
+        for (var i = 0; i < spans.snapshotLength; i++) {
+            var span = spans.snapshotItem(i);
+            var input = checkbox(i);
+            states.push({label: (span.innerText || span.textContent || '').trim(), checked: !!(input && input.checked)});
+        }
+        return states;
+    """
+
+    def get_category_states(self, xpath_categories: str, toggle=None) -> list:
+        """
+        Read the name, result count and checked flag of every category with a single injected script.
+
+        Parameters:
+        - xpath_categories: XPath of the category label elements.
+        - toggle: Indexes of the categories whose checkbox is clicked first, in the same call.
+
+        Returns:
+        - list: One dictionary per category with `name`, `count` (None if not shown) and `checked` keys.
+        """
+
+        xpath_categories = xpath_categories[len("xpath:"):] if xpath_categories.startswith("xpath:") else xpath_categories
+        states = self.browser.driver.execute_script(self.CATEGORY_STATES_SCRIPT, xpath_categories, list(toggle or []))
+
+        categories = []
+        for state in states:
+            match = CATEGORY_LABEL_PATTERN.match(state["label"])
+            count = match.group("count")
+            categories.append({
+                "name": match.group("name"),
+                "count": int(count.replace(",", "")) if count else None,
+                "checked": state["checked"],
+            })
+        return categories
+
+    def download_image_with_uuid(self, url: str, save_path: str, cache=None) -> str:
         """
         Download an image from a given URL and save it with a unique filename.
         
         Parameters:
         - url: The URL of the image to be downloaded.
         - save_path: The directory where the image should be saved.
+        - cache: Optional ImageCache checked before going to the network.
 
         Returns:
         - str: The path of the saved image file.
@@ -67,12 +254,20 @@ class Utility:
         filename = str(uuid.uuid4()) + ".jpg"
         filepath = os.path.join(save_path, filename)
 
-        # Download the image
-        if url:
-            urllib.request.urlretrieve(url, filepath)
-        else:
+        if not url:
             return ''
-        
+
+        content = cache.get(url) if cache else None
+        if content is None:
+            # Download the image
+            with urllib.request.urlopen(url) as response:
+                content = response.read()
+            if cache:
+                cache.put(url, content)
+
+        with open(filepath, "wb") as file:
+            file.write(content)
+
         return filename
 
     
@@ -84,56 +279,15 @@ class Utility:
         - date_text: The text representation of the date.
 
         Returns:
-        - str: The formatted date string.
+        - str: The formatted date string, or the original text if it cannot be parsed.
         """
-        
-        # Dictionary for mapping non-standard month abbreviations
-        month_abbr_mapping = {
-            "Jan.": "January",
-            "Feb.": "February",
-            "Mar.": "March",
-            "Apr.": "April",
-            "May": "May",
-            "June": "June",
-            "July": "July",
-            "Aug.": "August",
-            "Sept.": "September",
-            "Oct.": "October",
-            "Nov.": "November",
-            "Dec.": "December"
-        }
-        
-        # Replace non-standard month abbreviations with standard ones
-        date_text_cleaned = ' '.join([month_abbr_mapping.get(word, word) for word in date_text.split()])
-        
-        # If the date is in the format "Month Day", append the current year
-        if re.match(r'^[A-Za-z]+\s+\d+$', date_text_cleaned):
-            date_text_cleaned = f"{date_text_cleaned}, {datetime.datetime.now().year}"
-        
-        # Handle "Xh ago" format
-        hours_ago_match = re.match(r'(\d+)h ago', date_text)
-        if hours_ago_match:
-            hours = int(hours_ago_match.group(1))
-            date_obj = datetime.datetime.now() - datetime.timedelta(hours=hours)
-            return date_obj.strftime('%m/%d/%Y')
-        
-        # Handle "Xm ago" format
-        minutes_ago_match = re.match(r'(\d+)m ago', date_text)
-        if minutes_ago_match:
-            minutes = int(minutes_ago_match.group(1))
-            date_obj = datetime.datetime.now() - datetime.timedelta(minutes=minutes)
-            return date_obj.strftime('%m/%d/%Y')
-        
-        try:
-            # Try to parse the date using the full month name format
-            date_obj = datetime.datetime.strptime(date_text_cleaned, '%B %d, %Y')
-            
-            # Convert the datetime object to a formatted string "MM-DD-YYYY"
-            formatted_date = date_obj.strftime('%m/%d/%Y')
-            return formatted_date
-        except:
+
+        date = self.date_parser.parse(date_text)
+        if date is None:
             return date_text  # Return original date_text if there's an error
 
+        return date.strftime('%m/%d/%Y')
+
     def calculate_search_dates_range(self, number_of_months) -> dict:
         """
         Calculates the search dates range based on the given number of months from today.
@@ -157,32 +311,14 @@ class Utility:
             start_date = datetime.date(end_date.year, end_date.month, 1)
         else:
             # Adjust the starting month
+            from dateutil.relativedelta import relativedelta
+
             month_adjustment = number_of_months - 1 if number_of_months > 1 else 0
             start_date = (end_date - relativedelta(months=month_adjustment)).replace(day=1)
         
         return {"start_date": start_date.strftime('%m/%d/%Y'), "end_date": end_date.strftime('%m/%d/%Y')}
 
     
-    def is_date_in_range(self, date: str, search_dates_range: dict) -> bool:
-        """
-        Check if a given date is within a specified date range.
-        
-        Parameters:
-        - date: The date to check.
-        - start_date: The start of the date range.
-        - end_date: The end of the date range.
-
-        Returns:
-        - bool: True if the date is within the range, otherwise False.
-        """
-        start_date = datetime.datetime.strptime(search_dates_range['start_date'], '%m/%d/%Y')
-        end_date = datetime.datetime.strptime(search_dates_range['end_date'], '%m/%d/%Y')
-        current_date = datetime.datetime.strptime(date, '%m/%d/%Y')
-        
-        return start_date <= current_date <= end_date
-
-
-    
     def contains_money_format_on_title_or_description(self, title: str, description: str) -> bool:
         """
         Check if the provided text contains any mention of money in specified formats.
@@ -194,11 +330,8 @@ class Utility:
         - bool: True if money format is found, otherwise False.
         """
  
-        # Define a regex pattern to match the specified money formats
-        money_pattern = r"(\$[\d,]+(\.\d{1,2})?)|(\d+\s(dollars|USD))"
-        
-        # Search the pattern in the title and description
-        if re.search(money_pattern, title) or re.search(money_pattern, description):
+        # Search the precompiled money pattern in the title and description
+        if MONEY_PATTERN.search(title) or MONEY_PATTERN.search(description):
             return True
         return False
 
@@ -216,10 +349,122 @@ class Utility:
         - int: The total count of the search phrase in the title and description.
         """        
         # Counting occurrences of term in both title and description
-        count_in_title = title.lower().count(term.lower())
-        count_in_description = description.lower().count(term.lower())
-        
-        return count_in_title + count_in_description 
+        term = term.lower()
+        return title.lower().count(term) + description.lower().count(term)
+
+class Metrics:
+    """
+    Collects timing spans, counters and swallowed exceptions for a run.
+
+    `ErrorHandler.handle_errors` and `ErrorHandlingContext` record a span for every step they
+    wrap, so the existing error-handling wrappers double as instrumentation. Per-step totals
+    are always kept; individual spans are kept up to `max_spans` for the Chrome trace, and
+    only while `keep_spans` is set, since the per-article steps would otherwise make memory
+    grow with the number of results.
+    """
+
+    def __init__(self, max_spans: int = 100_000, keep_spans: bool = True):
+        self.max_spans = max_spans
+        self.keep_spans = keep_spans
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.steps = {}
+        self.counters = {}
+        self.errors = []
+        self.spans = []
+
+    def increment(self, name: str, value: int = 1):
+        """Add `value` to the counter `name`."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_span(self, name: str, started: float, error: Exception = None):
+        """
+        Record a finished step.
+
+        Parameters:
+        - name: The step name.
+        - started: `time.perf_counter()` value taken when the step started.
+        - error: The exception the step raised and that was swallowed, if any.
+        """
+        finished = time.perf_counter()
+        duration = finished - started
+        with self._lock:
+            step = self.steps.setdefault(name, {"calls": 0, "failures": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            step["calls"] += 1
+            step["total_seconds"] += duration
+            step["max_seconds"] = max(step["max_seconds"], duration)
+            if error is not None:
+                step["failures"] += 1
+                self.errors.append({"step": name, "type": type(error).__name__, "message": str(error), "at": round(finished - self._origin, 6)})
+            if self.keep_spans and len(self.spans) < self.max_spans:
+                self.spans.append((name, started - self._origin, duration, threading.get_ident(), error is not None))
+
+    def instrument_webdriver(self, driver):
+        """
+        Count every WebDriver command sent by `driver` (and the elements it returns).
+
+        Parameters:
+        - driver: The Selenium WebDriver instance.
+        """
+        if getattr(driver, "_metrics_instrumented", False):
+            return
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def counting_execute(driver_command, params=None):
+            self.increment("webdriver_calls")
+            self.increment(f"webdriver_calls.{driver_command}")
+            return execute(driver_command, params)
+
+        driver.execute = counting_execute
+        driver._metrics_instrumented = True
+
+    def summary(self) -> dict:
+        """Return the steps, counters and errors as a JSON-serializable dictionary."""
+        with self._lock:
+            return {
+                "started_at": datetime.datetime.fromtimestamp(self.started_at).isoformat(),
+                "wall_seconds": round(time.perf_counter() - self._origin, 3),
+                "steps": {name: {**step, "total_seconds": round(step["total_seconds"], 6), "max_seconds": round(step["max_seconds"], 6)} for name, step in self.steps.items()},
+                "counters": dict(self.counters),
+                "errors": list(self.errors),
+            }
+
+    def chrome_trace(self) -> dict:
+        """Return the recorded spans in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = [
+                {"name": name, "cat": "failed" if failed else "step", "ph": "X", "ts": round(start * 1e6), "dur": round(duration * 1e6), "pid": os.getpid(), "tid": thread_id}
+                for name, start, duration, thread_id, failed in self.spans
+            ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, output_directory: str, chrome_trace: bool = False):
+        """
+        Write `metrics.json`, and `trace.json` when `chrome_trace` is set, to `output_directory`.
+
+        Returns:
+        - str: Path of the metrics file.
+        """
+        os.makedirs(output_directory, exist_ok=True)
+        metrics_path = os.path.join(output_directory, "metrics.json")
+        with open(metrics_path, "w") as file:
+            json.dump(self.summary(), file, indent=4)
+        if chrome_trace:
+            with open(os.path.join(output_directory, "trace.json"), "w") as file:
+                json.dump(self.chrome_trace(), file)
+        return metrics_path
+
+
+# Shared by the whole run
+metrics = Metrics()
+
 
 class ErrorHandler:
     @staticmethod
@@ -227,22 +472,36 @@ class ErrorHandler:
         def decorator(func):
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
+                started = time.perf_counter()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except Exception as e:
+                    metrics.record_span(func.__qualname__, started, error=e)
                     # Here we're printing the error, but you can adapt this to log the error or take other actions.
                     print(f"{error_message} Original error: {str(e)}")
+                else:
+                    metrics.record_span(func.__qualname__, started)
+                    return result
             return wrapper
         return decorator
 
 class ErrorHandlingContext:
-    def __init__(self, message):
+    def __init__(self, message, span=None):
         self.message = message
+        # Name the step is recorded under in the run metrics, e.g. "clicking on magnifier button"
+        self.span = span or re.sub(r'^Error (when|while)\s+', '', message)
+        # The exception swallowed by the last use of the context, if any
+        self.error = None
 
     def __enter__(self):
+        self.started = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.error = exc_value
         if exc_type:
-            ErrorHandler.handle_errors(self.message)(lambda: None)()  # Use our error handler
+            metrics.record_span(self.span, self.started, error=exc_value)
+            print(f"{self.message} Original error: {str(exc_value)}")
+        else:
+            metrics.record_span(self.span, self.started)
         return True  # Suppress the exception
@@ -0,0 +1,206 @@
+import json
+import os
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from src.utility import metrics
+
+# Runs in the page: resolves with the name of the first locator that matches a visible element,
+# or null on timeout. A MutationObserver reacts to DOM changes as they happen and a short
+# interval catches changes that only affect visibility.
+WAIT_FOR_ANY_SCRIPT = """
+    var locators = arguments[0];
+    var timeoutMs = arguments[1];
+    var done = arguments[arguments.length - 1];
+    function find(locator) {
+        if (locator.kind === 'css') {
+            return document.querySelector(locator.selector);
+        }
+        return document.evaluate(locator.selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    function resolved() {
+        for (var i = 0; i < locators.length; i++) {
+            var element = find(locators[i]);
+            if (element && element.getClientRects().length) {
+                return locators[i].name;
+            }
+        }
+        return null;
+    }
+    var finished = false;
+    var observer, interval, timer;
+    function finish(result) {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearInterval(interval);
+        clearTimeout(timer);
+        done(result);
+    }
+    function check() {
+        var name = resolved();
+        if (name !== null) { finish(name); }
+    }
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    interval = setInterval(check, 100);
+    timer = setTimeout(function () { finish(null); }, timeoutMs);
+    check();
+"""
+
+# Runs in the page: resolves with true once more than `arguments[1]` elements match the CSS selector, false on timeout.
+WAIT_FOR_COUNT_SCRIPT = """
+    var selector = arguments[0];
+    var moreThan = arguments[1];
+    var timeoutMs = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var finished = false;
+    var observer, timer;
+    function finish(result) {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(result);
+    }
+    function check() {
+        if (document.querySelectorAll(selector).length > moreThan) { finish(true); }
+    }
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    timer = setTimeout(function () { finish(false); }, timeoutMs);
+    check();
+"""
+
+
+def to_js_locator(name: str, locator: str) -> dict:
+    """
+    Convert a config locator ("css:..." or an XPath) to the form the wait script understands.
+
+    Args:
+    - name (str): The name the wait resolves with when this locator matches.
+    - locator (str): The locator from config.json.
+
+    Returns:
+    - dict: The locator description.
+    """
+    if locator.startswith("css:"):
+        return {"name": name, "kind": "css", "selector": locator[len("css:"):]}
+    return {"name": name, "kind": "xpath", "selector": locator[len("xpath:"):] if locator.startswith("xpath:") else locator}
+
+
+class Waiter:
+    """
+    Waits on several page conditions at once and returns as soon as the first one resolves.
+
+    Each wait is a single asynchronous script run in the browser, so the wait ends the moment
+    the DOM changes instead of after a fixed blocking timeout. Timeouts come from the `timeouts`
+    section of config.json. With adaptive timeouts enabled, the observed latency of each wait
+    is saved between runs and the timeout shrinks to `multiplier` times its 95th percentile,
+    never going below `min_seconds` or above the configured timeout.
+
+    A wait whose script fails (script timeout, page unloaded mid-script, dead session) counts as
+    not resolved; the error is kept in `last_error` until the next wait, so callers can tell it apart.
+    """
+
+    def __init__(self, browser, timeouts: dict, adaptive_config: dict = None, default_timeout: float = 10):
+        self.browser = browser
+        self.timeouts = timeouts
+        self.default_timeout = default_timeout
+        self.adaptive_config = adaptive_config or {}
+        self.history_file = self.adaptive_config.get("history_file", "./.wait_latencies.json")
+        self.latencies = self._load_latencies() if self.adaptive_config.get("enabled", False) else {}
+        self.last_error = None
+
+    def timeout(self, name: str) -> float:
+        """
+        Return the timeout for a named wait.
+
+        Args:
+        - name (str): The key in the `timeouts` config section.
+
+        Returns:
+        - float: The timeout in seconds.
+        """
+        configured = self.timeouts.get(name, self.default_timeout)
+        observed = self.latencies.get(name)
+        if not self.adaptive_config.get("enabled", False) or not observed or len(observed) < self.adaptive_config.get("min_samples", 5):
+            return configured
+
+        p95 = sorted(observed)[int(0.95 * (len(observed) - 1))]
+        adaptive = p95 * self.adaptive_config.get("multiplier", 3)
+        return min(configured, max(self.adaptive_config.get("min_seconds", 1), adaptive))
+
+    def wait_for_any(self, locators: dict, timeout: float):
+        """
+        Wait until any of the locators matches a visible element.
+
+        Args:
+        - locators (dict): Name to config locator; use the `timeouts` key of the element as its name.
+        - timeout (float): Seconds to wait at most.
+
+        Returns:
+        - str | None: The name of the first locator that resolved, or None on timeout.
+        """
+        started = time.perf_counter()
+        name = self._run_wait_script(
+            timeout, WAIT_FOR_ANY_SCRIPT, [to_js_locator(name, locator) for name, locator in locators.items()], int(timeout * 1000)
+        )
+        if name is not None:
+            self.record(name, time.perf_counter() - started)
+        return name
+
+    def wait_for_count(self, css_selector: str, more_than: int, timeout: float) -> bool:
+        """
+        Wait until more than `more_than` elements match a CSS selector.
+
+        Args:
+        - css_selector (str): The CSS selector, with or without the "css:" prefix.
+        - more_than (int): The count to exceed.
+        - timeout (float): Seconds to wait at most.
+
+        Returns:
+        - bool: True if the count was exceeded in time.
+        """
+        css_selector = css_selector[len("css:"):] if css_selector.startswith("css:") else css_selector
+        started = time.perf_counter()
+        loaded = bool(self._run_wait_script(timeout, WAIT_FOR_COUNT_SCRIPT, css_selector, more_than, int(timeout * 1000)))
+        if loaded:
+            self.record("results_batch", time.perf_counter() - started)
+        return loaded
+
+    def _run_wait_script(self, timeout: float, script: str, *args):
+        """Run a wait script, returning None if the browser fails to run it."""
+        self.last_error = None
+        try:
+            self.browser.driver.set_script_timeout(timeout + 5)
+            return self.browser.driver.execute_async_script(script, *args)
+        except WebDriverException as e:
+            print(f"Error when waiting on the page. Original error: {str(e)}")
+            metrics.increment("wait_errors")
+            self.last_error = e
+            return None
+
+    def record(self, name: str, seconds: float):
+        """Remember how long a wait took."""
+        samples = self.latencies.setdefault(name, [])
+        samples.append(round(seconds, 3))
+        # Keep the most recent samples only
+        del samples[:-self.adaptive_config.get("history_size", 50)]
+
+    def save(self):
+        """Persist the observed latencies for the next run, when adaptive timeouts are enabled."""
+        if not self.adaptive_config.get("enabled", False):
+            return
+        with open(self.history_file, "w") as file:
+            json.dump(self.latencies, file)
+
+    def _load_latencies(self) -> dict:
+        if not os.path.exists(self.history_file):
+            return {}
+        try:
+            with open(self.history_file, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
@@ -1,12 +1,48 @@
+import sys
+
 from src.nyt_pages import HomePage, SearchResultsPage
-from RPA.Browser.Selenium import Selenium
-browser = Selenium()
 
-if __name__ == '__main__':
+
+def run_search():
+    # Imported and created here rather than at import time, so importing this module stays cheap
+    from RPA.Browser.Selenium import Selenium
+    browser = Selenium()
 
     home_page = HomePage(browser)
     home_page.open_the_website(home_page.url)
-    search_results_page = SearchResultsPage(browser)
-    search_results_page.apply_filters()
-    search_results_page.extract_articles()
+    return SearchResultsPage(browser)
+
+
+def produce():
+    """Split every input search into shard work items; no browser needed."""
+    from src.fan_out import produce_shards
+    search_results_page = SearchResultsPage(None)
+    search_results_page.process_work_items(lambda: produce_shards(search_results_page))
+
 
+def consume():
+    """Search every input shard and pass its records and images on to the reducer."""
+    from src.fan_out import consume_shard
+    search_results_page = run_search()
+    search_results_page.process_work_items(lambda: consume_shard(search_results_page))
+
+
+def merge():
+    """Merge the shards of every search into one report; no browser needed."""
+    from src.fan_out import ShardReducer
+    search_results_page = SearchResultsPage(None)
+    reducer = ShardReducer(search_results_page)
+    search_results_page.process_work_items(reducer.reduce_current_item, accept=reducer.is_shard)
+    reducer.finish()
+
+
+if __name__ == '__main__':
+    step = sys.argv[1] if len(sys.argv) > 1 else "search"
+    if step == "producer":
+        produce()
+    elif step == "consumer":
+        consume()
+    elif step == "reducer":
+        merge()
+    else:
+        run_search().process_work_items()